@@ -11,6 +11,25 @@ sim
     Possui classe responsável por simular, animar e salvar simulações de objetos.
 coisas
     Possui objetos simuláveis em `sim`.
+eventos
+    Possui eventos detectáveis durante as simulações (periastros, aproximações, escapes).
+trajetoria
+    Possui o armazenamento em blocos compartilháveis dos dados simulados.
+forcas
+    Possui termos de força vetorizados (gravidade suavizada, arrasto, campos constantes e molas).
+malha
+    Possui o cálculo da gravidade por partícula-malha, para cenas com muitos objetos.
+analise
+    Possui análises orbitais vetorizadas das trajetórias simuladas (elementos, apsides, áreas, distâncias mínimas).
+caos
+    Possui os expoentes de Lyapunov, calculados com trajetórias sombra integradas em lote.
+compartilhado
+    Possui a publicação do estado das simulações em memória compartilhada, para outros processos lerem.
+cache
+    Possui o cache em disco dos resultados de simulações.
+graficos
+    Possui a animação e os objetos gráficos, com a matplotlib. É importado só quando usado pelos métodos gráficos de
+    `sim.Sim`, então simulações sem animação dependem apenas do numpy.
 """
 
-__all__ = ['sim', 'coisas']
+__all__ = ['sim', 'coisas', 'eventos', 'forcas', 'malha', 'cache', 'analise', 'caos', 'compartilhado']
@@ -0,0 +1,308 @@
+"""
+Módulo com análises orbitais sobre as trajetórias guardadas de uma simulação (`Sim.dados`, `Sim.vels` e
+`Sim.tempos`). Todas as funções trabalham sobre todos os passos de uma vez, com arrays do numpy, sem loops por passo.
+
+Funções
+-------
+elementos(sim, obj, ref)
+    Elementos orbitais osculadores de `obj` em relação a `ref` em cada passo.
+taxa_areolar(sim, obj, ref)
+    Área varrida por unidade de tempo pelo vetor de `ref` a `obj` em cada passo.
+area_varrida(sim, obj, ref, inicio=0, fim=None)
+    Área varrida pelo vetor de `ref` a `obj` num intervalo de tempo.
+apsides(sim, obj, ref)
+    Instantes e distâncias das passagens pelo periastro e apoastro.
+distancias_minimas(sim, objs=None)
+    Menor distância entre cada par de objetos ao longo da simulação e o instante em que ela acontece.
+energia(sim)
+    Energia mecânica total do sistema em cada passo.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+Elementos = namedtuple('Elementos', ['a', 'e', 'periastro', 'anomalia', 'anomalia_media', 'periodo', 'energia',
+                                     'momento'])
+Elementos.__doc__ = """
+Elementos orbitais osculadores, cada um um array com um valor por passo: semi-eixo maior `a` (negativo para órbitas
+hiperbólicas), excentricidade `e`, ângulo do periastro em relação ao eixo x `periastro`, anomalia verdadeira
+`anomalia` e média `anomalia_media` (NaN se a órbita não for elíptica), `periodo` (NaN se não for elíptica), energia
+específica `energia` e momento angular específico `momento` (positivo no sentido anti-horário).
+"""
+
+Apsides = namedtuple('Apsides', ['t_periastro', 'r_periastro', 't_apoastro', 'r_apoastro'])
+Apsides.__doc__ = """
+Instantes e distâncias das passagens pelo periastro (`t_periastro`, `r_periastro`) e pelo apoastro (`t_apoastro`,
+`r_apoastro`), em arrays.
+"""
+
+
+def _sem_dados(sim):
+    if len(sim.tempos) == 0:
+        raise NameError('Não há dados de simulação neste objeto.'
+                        ' Tente fazer uma simulação usando o método `.simular()`.')
+
+
+def _relativos(sim, obj, ref):  # posições e velocidades de obj relativas a ref em todos os passos, e os instantes
+    _sem_dados(sim)
+    i = sim._get_index(obj)
+    j = sim._get_index(ref)
+    t = np.asarray(sim.tempos, dtype=float)
+    q = np.asarray(sim.dados[:, i], dtype=float) - np.asarray(sim.dados[:, j], dtype=float)
+    if len(sim.vels) == len(sim.dados):
+        u = np.asarray(sim.vels[:, i], dtype=float) - np.asarray(sim.vels[:, j], dtype=float)
+    elif len(t) > 1:  # sem velocidades guardadas, deriva as posições
+        u = np.gradient(q, t, axis=0)
+    else:
+        raise ValueError('São necessários ao menos dois passos'
+                         ' ou as velocidades guardadas (`configs[\'gravar_vel\']`).')
+    return t, q, u
+
+
+def _cruz(a, b):  # componente z do produto vetorial de vetores 2D
+    return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
+
+def elementos(sim, obj, ref):
+    """
+    Calcula os elementos orbitais osculadores (da órbita kepleriana que o objeto teria se só `ref` o atraísse) de `obj`
+    em relação a `ref` em todos os passos guardados.
+
+    Parâmetros
+    ----------
+    sim : sim.Sim
+        Simulação já feita.
+    obj : objeto de classe simulável, int ou str
+        Objeto, índice ou nome do objeto em órbita.
+    ref : objeto de classe simulável, int ou str
+        Objeto, índice ou nome do corpo central.
+
+    Retorna
+    -------
+    Elementos
+        Tupla nomeada de arrays com um valor por passo. Ver `Elementos`.
+
+    Raise
+    -----
+    NameError
+        Não há dados de simulação neste objeto.
+
+    Notas
+    -----
+    O parâmetro gravitacional usado é G * (m_obj + m_ref), com as massas atuais dos objetos. Se as velocidades não
+    tiverem sido guardadas, elas são estimadas por diferenças finitas das posições.
+    """
+    t, q, u = _relativos(sim, obj, ref)
+    mu = sim.configs['G'] * (sim.objs[sim._get_index(obj)].m + sim.objs[sim._get_index(ref)].m)
+
+    r = np.hypot(q[:, 0], q[:, 1])
+    v2 = np.einsum('ij,ij->i', u, u)
+    rv = np.einsum('ij,ij->i', q, u)
+    momento = _cruz(q, u)
+    energia = v2 / 2 - mu / r
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a = -mu / (2 * energia)
+        e_vec = ((v2 - mu / r)[:, None] * q - rv[:, None] * u) / mu  # vetor de excentricidade (aponta ao periastro)
+        e = np.hypot(e_vec[:, 0], e_vec[:, 1])
+        periastro = np.arctan2(e_vec[:, 1], e_vec[:, 0])
+        sentido = np.where(momento < 0, -1, 1)  # ângulos medidos no sentido do movimento
+        anomalia = np.mod(sentido * (np.arctan2(q[:, 1], q[:, 0]) - periastro), 2 * np.pi)
+
+        eliptica = (e < 1) & (a > 0)
+        periodo = np.where(eliptica, 2 * np.pi * np.sqrt(np.abs(a) ** 3 / mu), np.nan)
+        E = 2 * np.arctan(np.sqrt(np.abs((1 - e) / (1 + e))) * np.tan(anomalia / 2))  # anomalia excêntrica
+        anomalia_media = np.where(eliptica, np.mod(E - e * np.sin(E), 2 * np.pi), np.nan)
+    return Elementos(a, e, periastro, anomalia, anomalia_media, periodo, energia, momento)
+
+
+def taxa_areolar(sim, obj, ref):
+    """
+    Calcula a área varrida por unidade de tempo pelo vetor que liga `ref` a `obj` em cada passo (metade do momento
+    angular específico). Pela segunda lei de Kepler, ela é constante numa órbita de dois corpos.
+
+    Parâmetros
+    ----------
+    sim : sim.Sim
+        Simulação já feita.
+    obj, ref : objeto de classe simulável, int ou str
+        Objetos, índices ou nomes do satélite e do foco.
+
+    Retorna
+    -------
+    ndarray
+        Taxa areolar em cada passo (positiva no sentido anti-horário).
+    """
+    t, q, u = _relativos(sim, obj, ref)
+    return _cruz(q, u) / 2
+
+
+def area_varrida(sim, obj, ref, inicio=0, fim=None):
+    """
+    Calcula a área varrida pelo vetor que liga `ref` a `obj` entre dois instantes, a mesma que `Sim.area_kepler()`
+    desenha.
+
+    Parâmetros
+    ----------
+    sim : sim.Sim
+        Simulação já feita.
+    obj, ref : objeto de classe simulável, int ou str
+        Objetos, índices ou nomes do satélite e do foco.
+    inicio : int ou float, padrão=0
+        Instante inicial.
+    fim : int, float ou None, padrão=None
+        Instante final. None para o fim da simulação.
+
+    Retorna
+    -------
+    float
+        Área varrida (positiva no sentido anti-horário).
+
+    Notas
+    -----
+    A área é a soma dos triângulos entre o foco e cada par de posições consecutivas, então não depende das
+    velocidades e é exata para o polígono formado pelos passos guardados.
+    """
+    _sem_dados(sim)
+    t = np.asarray(sim.tempos)
+    p0 = np.searchsorted(t, inicio)
+    p1 = len(t) if fim is None else np.searchsorted(t, fim, side='right')
+    i = sim._get_index(obj)
+    j = sim._get_index(ref)
+    q = np.asarray(sim.dados[p0:p1, i], dtype=float) - np.asarray(sim.dados[p0:p1, j], dtype=float)
+    return float(_cruz(q[:-1], q[1:]).sum() / 2)
+
+
+def apsides(sim, obj, ref):
+    """
+    Encontra as passagens de `obj` pelo periastro e pelo apoastro da órbita ao redor de `ref`, como as mudanças de
+    sinal da velocidade radial entre dois passos.
+
+    Parâmetros
+    ----------
+    sim : sim.Sim
+        Simulação já feita.
+    obj, ref : objeto de classe simulável, int ou str
+        Objetos, índices ou nomes do satélite e do corpo central.
+
+    Retorna
+    -------
+    Apsides
+        Tupla nomeada com os instantes e distâncias de cada passagem.
+
+    Notas
+    -----
+    O instante é interpolado linearmente na velocidade radial e a distância por um polinômio cúbico de Hermite (com a
+    distância e a velocidade radial dos dois passos), então a precisão é bem melhor que o tamanho do passo. Para
+    encontrar as passagens durante a simulação com precisão de máquina, ver `eventos.vel_radial`.
+
+    Ver também
+    ----------
+    eventos.vel_radial
+    """
+    t, q, u = _relativos(sim, obj, ref)
+    r = np.hypot(q[:, 0], q[:, 1])
+    vr = np.einsum('ij,ij->i', q, u) / r  # velocidade radial
+    dt = np.diff(t)
+    s0, s1 = vr[:-1], vr[1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = np.clip(s0 / (s0 - s1), 0, 1)  # fração do passo onde vr zera
+    h00 = 2 * x ** 3 - 3 * x ** 2 + 1
+    h10 = x ** 3 - 2 * x ** 2 + x
+    h01 = 3 * x ** 2 - 2 * x ** 3
+    h11 = x ** 3 - x ** 2
+    r_ap = h00 * r[:-1] + h10 * dt * s0 + h01 * r[1:] + h11 * dt * s1
+    t_ap = t[:-1] + x * dt
+
+    peri = (s0 < 0) & (s1 >= 0)
+    apo = (s0 > 0) & (s1 <= 0)
+    return Apsides(t_ap[peri], r_ap[peri], t_ap[apo], r_ap[apo])
+
+
+def distancias_minimas(sim, objs=None, memoria=64):
+    """
+    Calcula a menor distância entre cada par de objetos ao longo de toda a simulação e o instante em que ela acontece.
+
+    Parâmetros
+    ----------
+    sim : sim.Sim
+        Simulação já feita.
+    objs : lista de objetos de classe simulável, int ou str, ou None, padrão=None
+        Objetos, índices ou nomes dos objetos. None para todos.
+    memoria : int ou float, padrão=64
+        Memória máxima, em MB, dos arrays temporários. Os passos são processados em blocos que cabem nela.
+
+    Retorna
+    -------
+    tuple de ndarray
+        Matriz (N, N) com as menores distâncias (infinito na diagonal) e matriz (N, N) com os instantes em que elas
+        acontecem, na ordem de `objs`.
+    """
+    _sem_dados(sim)
+    inds = list(range(len(sim.objs))) if objs is None else [sim._get_index(o) for o in objs]
+    n = len(inds)
+    t = np.asarray(sim.tempos)
+    bloco = max(1, int(memoria * 1024 ** 2 // (max(n, 1) ** 2 * 8 * 4)))  # passos por bloco
+    d_min = np.full((n, n), np.inf)
+    p_min = np.zeros((n, n), dtype=int)
+    diagonal = np.eye(n, dtype=bool)
+    for ini in range(0, len(t), bloco):
+        s = np.asarray(sim.dados[ini:ini + bloco, inds], dtype=float)  # (passos, n, 2)
+        d = s[:, :, None, :] - s[:, None, :, :]
+        d = np.sqrt(np.einsum('...k,...k->...', d, d))
+        d[:, diagonal] = np.inf
+        k = np.argmin(d, axis=0)
+        d = np.take_along_axis(d, k[None], axis=0)[0]
+        menor = d < d_min
+        d_min[menor] = d[menor]
+        p_min[menor] = k[menor] + ini
+    return d_min, np.where(diagonal, np.nan, t[p_min])
+
+
+def energia(sim, memoria=64):
+    """
+    Calcula a energia mecânica total (cinética mais potencial gravitacional de todos os pares) do sistema em cada
+    passo. Numa simulação só com gravidade ela deveria ser constante, então sua variação relativa mede o erro da
+    integração (por exemplo, ao comparar integradores, passos ou `configs['precisao']`).
+
+    Parâmetros
+    ----------
+    sim : sim.Sim
+        Simulação já feita, com as velocidades guardadas.
+    memoria : int ou float, padrão=64
+        Memória máxima, em MB, dos arrays temporários. Os passos são processados em blocos que cabem nela.
+
+    Retorna
+    -------
+    ndarray
+        Energia total em cada passo.
+
+    Raise
+    -----
+    NameError
+        Não há dados de simulação neste objeto.
+    ValueError
+        As velocidades não foram guardadas.
+
+    Notas
+    -----
+    A energia é calculada em float64, mesmo que os dados estejam guardados em float32. Só a gravidade por soma direta
+    entra na energia potencial: forças de `configs['forcas']` (arrasto, molas) não são contadas.
+    """
+    _sem_dados(sim)
+    if len(sim.vels) != len(sim.dados):
+        raise ValueError('As velocidades não foram guardadas (`configs[\'gravar_vel\']`).')
+    m = np.array([o.m for o in sim.objs], dtype=float)
+    n = len(m)
+    mm = np.triu(m[:, None] * m[None, :], 1)  # produto das massas de cada par, contado uma vez
+    t = len(sim.tempos)
+    bloco = max(1, int(memoria * 1024 ** 2 // (max(n, 1) ** 2 * 8 * 4)))  # passos por bloco
+    e = np.empty(t)
+    for ini in range(0, t, bloco):
+        s = np.asarray(sim.dados[ini:ini + bloco], dtype=float)
+        v = np.asarray(sim.vels[ini:ini + bloco], dtype=float)
+        d = s[:, :, None, :] - s[:, None, :, :]
+        r = np.sqrt(np.einsum('...k,...k->...', d, d))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            potencial = -sim.configs['G'] * np.where(mm > 0, mm / r, 0.0).sum((-1, -2))
+        e[ini:ini + bloco] = 0.5 * np.einsum('n,pnk,pnk->p', m, v, v) + potencial
+    return e
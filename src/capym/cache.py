@@ -0,0 +1,169 @@
+"""
+Módulo com o cache em disco dos resultados de simulações, para não recalcular cenas idênticas (por exemplo, ao ajustar
+só a animação e rodar o script de novo).
+
+Classes
+-------
+CacheResultados
+    Cache em disco de trajetórias simuladas, endereçado pelo conteúdo da simulação.
+"""
+
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+_VERSAO = 1  # muda quando o formato dos arquivos ou o cálculo das chaves mudar
+
+
+class CacheResultados:
+    """
+    Cache em disco de trajetórias simuladas. Cada resultado é guardado num arquivo `.npz` cujo nome é o hash (SHA-256)
+    de tudo que determina a simulação: posições, velocidades e massas iniciais, `G`, `h`, número de passos e
+    integrador. Quando o tamanho total passa do limite, os resultados usados há mais tempo são apagados.
+
+    Atributos
+    ---------
+    diretorio : str
+        Pasta onde os resultados ficam guardados.
+    max_mb : int ou float
+        Tamanho máximo, em MB, de todos os resultados guardados.
+
+    Métodos
+    -------
+    chave(s, v, m, **params)
+        Calcula a chave de uma simulação.
+    ler(chave)
+        Retorna o resultado guardado com a chave, ou None.
+    guardar(chave, **arrays)
+        Guarda um resultado e apaga os mais antigos se passar do limite.
+    limpar()
+        Apaga todos os resultados guardados.
+
+    Ver também
+    ----------
+    sim.Sim.simular
+
+    Notas
+    -----
+    Como a chave depende só do conteúdo, a mesma pasta pode ser usada por vários scripts e processos. Cada leitura
+    atualiza a data de modificação do arquivo, que serve para saber quais foram usados há mais tempo.
+    """
+    def __init__(self, diretorio='.capym_cache', max_mb=1024):
+        """
+        Parâmetros
+        ----------
+        diretorio : str, padrão='.capym_cache'
+            Pasta onde os resultados ficam guardados. É criada se não existir.
+        max_mb : int ou float, padrão=1024
+            Tamanho máximo, em MB, de todos os resultados guardados.
+        """
+        self.diretorio = diretorio
+        self.max_mb = max_mb
+        os.makedirs(diretorio, exist_ok=True)
+
+    def chave(self, s, v, m, **params):
+        """
+        Calcula a chave (hash hexadecimal) de uma simulação.
+
+        Parâmetros
+        ----------
+        s, v : ndarray de formato (N, 2)
+            Posições e velocidades iniciais.
+        m : ndarray de formato (N,)
+            Massas.
+        **params
+            Outros parâmetros que determinam o resultado (como `G`, `h` e `integrador`), com valores representáveis
+            como texto.
+
+        Retorna
+        -------
+        str
+        """
+        h = hashlib.sha256(f'capym-{_VERSAO}'.encode())
+        for a in (s, v, m):
+            a = np.ascontiguousarray(a, dtype=float)
+            h.update(repr(a.shape).encode())
+            h.update(a.tobytes())
+        h.update(repr(sorted(params.items())).encode())
+        return h.hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave + '.npz')
+
+    def ler(self, chave):
+        """
+        Retorna o resultado guardado com a chave, ou None se não houver.
+
+        Parâmetros
+        ----------
+        chave : str
+            Chave calculada por `chave()`.
+
+        Retorna
+        -------
+        dict de ndarray ou None
+            Arrays guardados por `guardar()`.
+        """
+        caminho = self._caminho(chave)
+        try:
+            with np.load(caminho) as arq:
+                resultado = {k: arq[k] for k in arq.files}
+        except (OSError, ValueError):  # não existe, ou foi apagado ou corrompido no meio da leitura
+            return None
+        try:
+            os.utime(caminho)  # marca como usado agora
+        except OSError:
+            pass
+        return resultado
+
+    def guardar(self, chave, **arrays):
+        """
+        Guarda um resultado e apaga os usados há mais tempo se o tamanho total passar de `max_mb`. Um resultado que
+        sozinho já passa de `max_mb` não é guardado, já que seria apagado logo em seguida.
+
+        Parâmetros
+        ----------
+        chave : str
+            Chave calculada por `chave()`.
+        **arrays
+            Arrays a guardar.
+        """
+        tamanho = sum(np.asarray(a).nbytes for a in arrays.values())
+        if tamanho > self.max_mb * 1024 ** 2:
+            print(f'Resultado de {tamanho / 1024 ** 2:.1f} MB maior que o limite do cache ({self.max_mb} MB),'
+                  ' então não foi guardado.')
+            return
+        # escreve num arquivo temporário e renomeia, para que leituras simultâneas nunca vejam um arquivo pela metade
+        fd, temp = tempfile.mkstemp(suffix='.npz', dir=self.diretorio, prefix='.temp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(temp, self._caminho(chave))
+        except BaseException:
+            os.remove(temp)
+            raise
+        self._despejar()
+
+    def _despejar(self):  # apaga os resultados usados há mais tempo até caber no limite
+        arquivos = []
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.endswith('.npz') and not entrada.name.startswith('.temp-'):
+                info = entrada.stat()
+                arquivos.append((info.st_mtime, info.st_size, entrada.path))
+        total = sum(a[1] for a in arquivos)
+        limite = self.max_mb * 1024 ** 2
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= limite:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:  # outro processo já apagou
+                pass
+            total -= tamanho
+
+    def limpar(self):
+        """Apaga todos os resultados guardados."""
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.endswith('.npz'):
+                os.remove(entrada.path)
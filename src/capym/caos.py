@@ -0,0 +1,115 @@
+"""
+Módulo com medidas de caos (sensibilidade às condições iniciais) de simulações. A trajetória principal e trajetórias
+"sombra", levemente perturbadas, são integradas juntas num único passo vetorizado, com os arrays em lote do numpy, em
+vez de uma simulação separada para cada perturbação.
+
+Funções
+-------
+lyapunov(sim, t, h=None, quantidade=1, eps=1e-8, renormalizar=10, semente=None)
+    Expoentes de Lyapunov de tempo finito a partir do estado atual da simulação.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+Lyapunov = namedtuple('Lyapunov', ['expoentes', 'tempos', 'evolucao'])
+Lyapunov.__doc__ = """
+Expoentes de Lyapunov de tempo finito `expoentes` (do maior para o menor), os instantes `tempos` de cada
+renormalização e a estimativa dos expoentes em cada um deles `evolucao`, de formato (len(tempos), quantidade), útil
+para ver se a estimativa já convergiu.
+"""
+
+
+def _fase(s, v):  # vetores no espaço de fase (posições e velocidades juntas) de cada sistema do lote
+    return np.concatenate((s.reshape(len(s), -1), v.reshape(len(v), -1)), axis=1)
+
+
+def lyapunov(sim, t, h=None, quantidade=1, eps=1e-8, renormalizar=10, semente=None):
+    """
+    Calcula os maiores expoentes de Lyapunov de tempo finito da simulação a partir do seu estado atual, pelo método de
+    Benettin: `quantidade` trajetórias sombra começam a uma distância `eps` da principal em direções ortogonais do
+    espaço de fase e, a cada `renormalizar` passos, os desvios são reortogonalizados (Gram–Schmidt, pela decomposição
+    QR) e trazidos de volta à distância `eps`. O logaritmo do crescimento de cada desvio, somado e dividido pelo tempo,
+    é o expoente.
+
+    Parâmetros
+    ----------
+    sim : sim.Sim
+        Simulação com os objetos no estado inicial desejado. Ela não é alterada.
+    t : int ou float
+        Tempo total de integração em segundos.
+    h : float ou None, padrão=None
+        Tamanho do passo. None para o `h` da simulação.
+    quantidade : int, padrão=1
+        Número de expoentes calculados (e de trajetórias sombra), no máximo 4 vezes o número de objetos.
+    eps : float, padrão=1e-8
+        Distância das trajetórias sombra à principal no espaço de fase.
+    renormalizar : int, padrão=10
+        Número de passos entre as renormalizações.
+    semente : int ou None, padrão=None
+        Semente das direções iniciais das perturbações.
+
+    Retorna
+    -------
+    Lyapunov
+        Tupla nomeada com os expoentes e a evolução deles. Ver `Lyapunov`.
+
+    Raise
+    -----
+    ValueError
+        Nenhum objeto adicionado à simulação, mais expoentes que dimensões do espaço de fase, ou tempo de integração
+        não positivo.
+
+    Notas
+    -----
+    As sombras usam o integrador e as forças configurados na simulação, em float64 qualquer que seja
+    `configs['precisao']`. O espaço de fase junta posições e velocidades sem pesos, então os expoentes dependem
+    levemente das unidades escolhidas em tempos curtos, mas não no limite de tempos longos.
+
+    `eps` precisa ser pequeno o bastante para que os desvios fiquem lineares entre renormalizações e grande o bastante
+    para não se perder em erros de arredondamento. Num sistema regular (como a figura em oito de três corpos) os
+    expoentes tendem a zero como 1/t; num sistema caótico o maior deles fica positivo.
+
+    Exemplos
+    --------
+    ly = caos.lyapunov(s, 100, quantidade=3)
+    ly.expoentes  # os três maiores expoentes
+    """
+    if len(sim.objs) == 0:
+        raise ValueError('Nenhum objeto adicionado a simulação atual.')
+    h = sim.h if h is None else h
+    s, v, m = (a.astype(float) for a in sim.estado())
+    dim = s.size + v.size
+    if not 1 <= quantidade <= dim:
+        raise ValueError(f'O número de expoentes deve estar entre 1 e {dim} (dimensões do espaço de fase).')
+    n = len(np.arange(0, t, h))  # número de passos, como em `Sim.simular`
+    if n == 0:
+        raise ValueError('O tempo de integração deve ser positivo.')
+    print('Calculando {} iterações de {} trajetórias.'.format(n, quantidade + 1))
+
+    passo = sim._integrador(m)
+    rng = np.random.default_rng(semente)
+    desvios = np.linalg.qr(rng.normal(size=(dim, quantidade)))[0]  # direções iniciais ortonormais, uma por coluna
+
+    def sombras(s0, v0, desvios):  # lote com a trajetória principal seguida das sombras
+        d = eps * desvios.T
+        return (np.concatenate((s0[None], s0 + d[:, :s.size].reshape(-1, *s.shape))),
+                np.concatenate((v0[None], v0 + d[:, s.size:].reshape(-1, *v.shape))))
+
+    lote_s, lote_v = sombras(s, v, desvios)
+    soma = np.zeros(quantidade)
+    tempos = []
+    evolucao = []
+    for i in range(1, n + 1):
+        lote_s, lote_v = passo(lote_s, lote_v, h)
+        if i % renormalizar == 0 or i == n:
+            fase = _fase(lote_s, lote_v)
+            desvios, r = np.linalg.qr((fase[1:] - fase[0]).T / eps)
+            soma += np.log(np.abs(np.diag(r)))  # crescimento de cada direção desde a última renormalização
+            tempos.append(i * h)
+            evolucao.append(soma / (i * h))
+            lote_s, lote_v = sombras(lote_s[0], lote_v[0], desvios)
+
+    evolucao = np.array(evolucao)
+    ordem = np.argsort(-evolucao[-1])  # a decomposição QR já tende a ordenar, mas não garante em tempos curtos
+    return Lyapunov(evolucao[-1, ordem], np.array(tempos), evolucao[:, ordem])
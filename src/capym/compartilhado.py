@@ -0,0 +1,309 @@
+"""
+Módulo com a publicação do estado de uma simulação em memória compartilhada (`multiprocessing.shared_memory`), para
+que outros processos locais (painéis, renderizadores) acompanhem uma simulação em andamento sem copiar arquivos nem
+serializar a `Sim`.
+
+O bloco de memória tem um cabeçalho pequeno, o estado atual e os últimos passos guardados num buffer circular. A
+consistência é garantida por um contador de sequência ('seqlock'): o publicador o deixa ímpar enquanto escreve e par
+quando termina, e o leitor só aceita uma cópia se o contador era par e não mudou durante a leitura. Assim o
+publicador nunca espera pelos leitores.
+
+Classes
+-------
+Publicador
+    Escreve o estado da simulação no bloco compartilhado, para usar em `Sim.configs['publicar']`.
+Leitor
+    Lê, de outro processo, instantâneos consistentes de um bloco publicado.
+"""
+
+from collections import namedtuple
+import secrets
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+
+_MAGICO = 0x4341_5059_4D53_484D  # identifica blocos do capym
+_VERSAO = 1
+_CABECALHO = 8  # int64: mágico, versão, sequência, N, capacidade, passos escritos e dois reservados
+_ESCALARES = 2  # float64: instante atual e passo
+_trava_registro = threading.Lock()  # trava da troca de `resource_tracker.register` em `_abrir`
+
+Instantaneo = namedtuple('Instantaneo', ['seq', 't', 'h', 's', 'v', 'tempos', 'dados'])
+Instantaneo.__doc__ = """
+Cópia consistente de um bloco publicado: número de sequência `seq` da publicação, instante `t` e passo `h` atuais,
+posições `s` e velocidades `v` atuais de formato (N, 2), e os últimos passos guardados, com instantes `tempos` e
+posições `dados` de formato (passos, N, 2), do mais antigo ao mais novo.
+"""
+
+
+def _vistas(buf, n, capacidade):  # arrays do numpy sobre o bloco, sem cópia
+    cab = np.ndarray((_CABECALHO,), np.int64, buf, 0)
+    inicio = cab.nbytes
+    escalares = np.ndarray((_ESCALARES,), np.float64, buf, inicio)
+    inicio += escalares.nbytes
+    s = np.ndarray((n, 2), np.float64, buf, inicio)
+    inicio += s.nbytes
+    v = np.ndarray((n, 2), np.float64, buf, inicio)
+    inicio += v.nbytes
+    tempos = np.ndarray((capacidade,), np.float64, buf, inicio)
+    inicio += tempos.nbytes
+    dados = np.ndarray((capacidade, n, 2), np.float64, buf, inicio)
+    return cab, escalares, s, v, tempos, dados
+
+
+def _abrir(nome):  # abre um bloco existente sem registrá-lo no `resource_tracker`
+    # o leitor não é dono do bloco: se ele fosse registrado, o Python o apagaria quando este processo terminasse. Antes
+    # do Python 3.13 não há `track=False`, e desfazer o registro depois (`unregister`) apagaria também o do publicador
+    # quando os dois dividem o mesmo rastreador (mesmo processo ou processos filhos), então o registro é suprimido.
+    # A troca vale para o processo todo: a trava a protege de leitores e publicadores em outras threads, mas um bloco
+    # criado por outro código em outra thread bem nesse instante também deixaria de ser registrado
+    try:
+        return shared_memory.SharedMemory(nome, track=False)
+    except TypeError:  # Python < 3.13, sem `track`
+        pass
+    with _trava_registro:
+        registrar = resource_tracker.register
+        resource_tracker.register = lambda nome, tipo: None
+        try:
+            return shared_memory.SharedMemory(nome)
+        finally:
+            resource_tracker.register = registrar
+
+
+def _tamanho(n, capacidade):  # bytes do bloco
+    return 8 * (_CABECALHO + _ESCALARES + 4 * n + capacidade * (1 + 2 * n))
+
+
+class Publicador:
+    """
+    Publica o estado atual e os últimos passos de uma simulação num bloco de memória compartilhada. Com
+    `sim.configs['publicar'] = Publicador(...)`, `Sim.simular()` publica sozinho durante a simulação.
+
+    Atributos
+    ---------
+    nome : str
+        Nome do bloco de memória compartilhada, usado por `Leitor(nome)` em outros processos.
+    capacidade : int
+        Número de passos recentes mantidos no bloco.
+    intervalo : float
+        Intervalo mínimo, em segundos de relógio, entre publicações durante `simular()`.
+
+    Métodos
+    -------
+    publicar(t, s, v, tempos=(), dados=(), h=0.0)
+        Escreve o estado atual e passos novos no bloco.
+    fechar()
+        Libera e apaga o bloco.
+
+    Ver também
+    ----------
+    Leitor
+    sim.Sim.simular
+
+    Notas
+    -----
+    O bloco é criado na primeira publicação, quando o número de objetos é conhecido, e depois não muda de tamanho.
+    Publicar é só copiar alguns arrays pequenos, e durante `simular()` isso acontece no máximo uma vez a cada
+    `intervalo`, então o custo para o integrador é desprezível. Tudo é guardado em float64.
+    """
+    def __init__(self, nome=None, capacidade=1000, intervalo=1 / 60):
+        """
+        Parâmetros
+        ----------
+        nome : str ou None, padrão=None
+            Nome do bloco de memória compartilhada. None para um nome aleatório, que fica em `nome`.
+        capacidade : int, padrão=1000
+            Número de passos recentes mantidos no bloco.
+        intervalo : float, padrão=1/60
+            Intervalo mínimo, em segundos de relógio, entre publicações durante `simular()`.
+        """
+        self.nome = f'capym-{secrets.token_hex(6)}' if nome is None else nome
+        self.capacidade = int(capacidade)
+        self.intervalo = intervalo
+        self._shm = None
+        self._vistas = None
+
+    def __getstate__(self):  # o bloco não é copiado junto (ex. em `copy.deepcopy` e `pickle`)
+        estado = self.__dict__.copy()
+        estado['_shm'] = None
+        estado['_vistas'] = None
+        return estado
+
+    def _criar(self, n):
+        with _trava_registro:  # não cria durante a troca de `resource_tracker.register` de um leitor
+            self._shm = shared_memory.SharedMemory(self.nome, create=True, size=_tamanho(n, self.capacidade))
+        self._vistas = _vistas(self._shm.buf, n, self.capacidade)
+        cab = self._vistas[0]
+        cab[:] = 0
+        cab[0], cab[1], cab[3], cab[4] = _MAGICO, _VERSAO, n, self.capacidade
+
+    def publicar(self, t, s, v, tempos=(), dados=(), h=0.0):
+        """
+        Escreve o estado atual e os passos novos no bloco, criando-o na primeira vez.
+
+        Parâmetros
+        ----------
+        t : float
+            Instante do estado atual.
+        s, v : ndarray de formato (N, 2)
+            Posições e velocidades atuais.
+        tempos : array_like de formato (passos,), padrão=()
+            Instantes dos passos novos desde a última publicação.
+        dados : array_like de formato (passos, N, 2), padrão=()
+            Posições dos passos novos. Só os últimos `capacidade` são mantidos.
+        h : float, padrão=0.0
+            Passo da simulação.
+
+        Raise
+        -----
+        ValueError
+            O número de objetos mudou desde a criação do bloco.
+        """
+        n = len(s)
+        if self._shm is None:
+            self._criar(n)
+        cab, escalares, s_buf, v_buf, t_buf, d_buf = self._vistas
+        if n != cab[3]:
+            raise ValueError(f'O bloco "{self.nome}" foi criado para {cab[3]} objetos e não pode publicar {n}.')
+        tempos = np.asarray(tempos, dtype=float)[-self.capacidade:]
+        k = len(tempos)
+
+        cab[2] += 1  # sequência ímpar: escrita em andamento
+        try:
+            escalares[:] = t, h
+            s_buf[:] = s
+            v_buf[:] = v
+            if k:
+                pos = (cab[5] + np.arange(k)) % self.capacidade  # posições no buffer circular
+                t_buf[pos] = tempos
+                d_buf[pos] = np.asarray(dados)[-k:]
+                cab[5] += k
+        finally:  # mesmo com erro (ex. `dados` de formato errado), senão os leitores esperariam para sempre
+            cab[2] += 1  # sequência par: escrita terminada
+
+    def fechar(self):
+        """Libera e apaga o bloco. Leitores que já o abriram continuam com a cópia mapeada até fecharem."""
+        if self._shm is not None:
+            self._vistas = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class Leitor:
+    """
+    Lê um bloco escrito por um `Publicador`, normalmente em outro processo.
+
+    Atributos
+    ---------
+    nome : str
+        Nome do bloco.
+    n : int
+        Número de objetos.
+    capacidade : int
+        Número de passos recentes mantidos no bloco.
+    s, v : ndarray de formato (N, 2)
+        Vistas sem cópia das posições e velocidades atuais no bloco (podem mudar durante a leitura).
+    seq : int
+        Número de sequência atual: muda a cada publicação, então serve para saber se há algo novo sem copiar nada.
+
+    Métodos
+    -------
+    ler(espera=1.0)
+        Retorna um `Instantaneo` consistente.
+    fechar()
+        Desfaz o mapeamento do bloco.
+
+    Notas
+    -----
+    As vistas `s` e `v` são para quem aceita ler no meio de uma escrita (por exemplo, para desenhar um frame). Para
+    um estado consistente, use `ler()`, que copia os arrays e confere o contador de sequência.
+
+    Antes do Python 3.13, abrir um leitor desliga por um instante o registro de blocos de memória compartilhada no
+    processo todo (ver `multiprocessing.resource_tracker`). Publicadores e leitores do capym esperam por isso, mas um
+    bloco criado ao mesmo tempo por outro código, em outra thread, pode ficar sem registro.
+    """
+    def __init__(self, nome):
+        """
+        Parâmetros
+        ----------
+        nome : str
+            Nome do bloco (o `nome` do publicador).
+
+        Raise
+        -----
+        FileNotFoundError
+            O bloco ainda não existe (nada foi publicado) ou já foi apagado.
+        ValueError
+            O bloco não foi criado por um `Publicador`.
+        """
+        self.nome = nome
+        self._shm = _abrir(nome)
+        cab = np.ndarray((_CABECALHO,), np.int64, self._shm.buf, 0)
+        if cab[0] != _MAGICO or cab[1] != _VERSAO:
+            self._shm.close()
+            raise ValueError(f'O bloco "{nome}" não foi criado por um `compartilhado.Publicador` desta versão.')
+        self.n = int(cab[3])
+        self.capacidade = int(cab[4])
+        vistas = _vistas(self._shm.buf, self.n, self.capacidade)
+        self._cab, self._escalares, self.s, self.v, self._tempos, self._dados = vistas
+
+    @property
+    def seq(self):
+        return int(self._cab[2])
+
+    def ler(self, espera=1.0):
+        """
+        Copia o estado atual e os passos recentes de forma consistente (todos da mesma publicação).
+
+        Parâmetros
+        ----------
+        espera : float, padrão=1.0
+            Tempo máximo, em segundos, esperando uma escrita terminar.
+
+        Retorna
+        -------
+        Instantaneo
+
+        Raise
+        -----
+        TimeoutError
+            Não foi possível ler uma cópia consistente dentro de `espera`.
+        """
+        limite = time.monotonic() + espera
+        while True:
+            seq = int(self._cab[2])
+            if seq % 2 == 0:
+                escritos = int(self._cab[5])
+                t, h = self._escalares
+                s = self.s.copy()
+                v = self.v.copy()
+                k = min(escritos, self.capacidade)
+                pos = (escritos - k + np.arange(k)) % self.capacidade  # do mais antigo ao mais novo
+                tempos = self._tempos[pos]
+                dados = self._dados[pos]
+                if int(self._cab[2]) == seq:  # nenhuma escrita começou durante a cópia
+                    return Instantaneo(seq, float(t), float(h), s, v, tempos, dados)
+            if time.monotonic() > limite:
+                raise TimeoutError(f'Não foi possível ler uma cópia consistente do bloco "{self.nome}".')
+            time.sleep(0)
+
+    def fechar(self):
+        """Desfaz o mapeamento do bloco (sem apagá-lo)."""
+        if self._shm is not None:
+            self._cab = self._escalares = self.s = self.v = self._tempos = self._dados = None
+            self._shm.close()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,163 @@
+"""
+Módulo com eventos que podem ser detectados durante `sim.Sim.simular()`, como passagens pelo periastro, aproximações e
+escapes.
+
+Um evento é definido por uma função do estado da simulação que muda de sinal quando o evento acontece. O instante exato
+é encontrado por busca de raiz dentro do passo em que a mudança de sinal ocorreu, então não é preciso diminuir `h` só
+para resolver o instante do evento.
+
+Classes
+-------
+Evento
+    Evento definido por uma função qualquer do estado.
+Ocorrencia
+    Registro de um evento detectado, guardado em `Sim.ocorrencias`.
+
+Funções
+-------
+distancia(a, b, d, direcao=0, terminal=False, nome='distancia')
+    Evento de quando a distância entre dois objetos passa por `d`.
+vel_radial(a, b, direcao=0, terminal=False, nome='apside')
+    Evento de quando a velocidade radial entre dois objetos muda de sinal (periastro ou apoastro).
+"""
+
+from collections import namedtuple
+import numpy as np
+
+Ocorrencia = namedtuple('Ocorrencia', ['t', 'nome', 's', 'v'])
+Ocorrencia.__doc__ = """
+Registro de um evento detectado: o instante `t`, o `nome` do evento e as posições `s` e velocidades `v` de todos os
+objetos nesse instante.
+"""
+
+
+class Evento:
+    """
+    Evento definido por uma função do estado da simulação, que acontece quando ela muda de sinal.
+
+    Atributos
+    ---------
+    funcao : function
+        Função `funcao(t, s, v, *inds)` que recebe o instante, as posições e velocidades de todos os objetos (arrays de
+        formato (N, 2)) e os índices dos objetos em `objs`, e retorna um número.
+    objs : tuple
+        Objetos, índices ou nomes dos objetos usados pela função, passados para ela como índices.
+    direcao : int
+        1 para detectar só quando a função passa de negativa para positiva, -1 para o contrário e 0 para ambos.
+    terminal : bool
+        Se True, a simulação para no instante do evento.
+    nome : str
+        Nome do evento, usado nos registros.
+
+    Ver também
+    ----------
+    sim.Sim.simular
+    """
+    def __init__(self, funcao, objs=(), direcao=0, terminal=False, nome='evento'):
+        """
+        Parâmetros
+        ----------
+        funcao : function
+            Função `funcao(t, s, v, *inds)` que retorna um número, cujo zero marca o evento.
+        objs : tuple, padrão=()
+            Objetos, índices ou nomes dos objetos cujos índices são passados para `funcao`.
+        direcao : int, padrão=0
+            1 para detectar só quando a função passa de negativa para positiva, -1 para o contrário e 0 para ambos.
+        terminal : bool, padrão=False
+            Se True, a simulação para no instante do evento.
+        nome : str, padrão='evento'
+            Nome do evento, usado nos registros.
+        """
+        self.funcao = funcao
+        self.objs = tuple(objs)
+        self.direcao = direcao
+        self.terminal = terminal
+        self.nome = nome
+
+    def _preparar(self, sim):  # retorna a função g(t, s, v) com os índices dos objetos já resolvidos
+        inds = [sim._get_index(o) for o in self.objs]
+        return lambda t, s, v: self.funcao(t, s, v, *inds)
+
+    def _cruzou(self, g0, g1):  # testa se houve mudança de sinal na direção do evento
+        if self.direcao >= 0 and g0 < 0 <= g1:
+            return True
+        return self.direcao <= 0 and g0 > 0 >= g1
+
+
+def distancia(a, b, d, direcao=0, terminal=False, nome='distancia'):
+    """
+    Cria um evento de quando a distância entre os objetos `a` e `b` passa pelo valor `d`.
+
+    Parâmetros
+    ----------
+    a, b : objeto de classe simulável, int ou str
+        Objetos, índices ou nomes dos objetos.
+    d : int ou float
+        Distância limite.
+    direcao : int, padrão=0
+        1 para quando os objetos se afastam além de `d` (escape), -1 para quando se aproximam abaixo de `d`
+        (aproximação) e 0 para ambos.
+    terminal : bool, padrão=False
+        Se True, a simulação para no instante do evento.
+    nome : str, padrão='distancia'
+        Nome do evento, usado nos registros.
+
+    Retorna
+    -------
+    Evento
+    """
+    def funcao(t, s, v, i, j):
+        return np.hypot(*(s[i] - s[j])) - d
+    return Evento(funcao, (a, b), direcao, terminal, nome)
+
+
+def vel_radial(a, b, direcao=0, terminal=False, nome='apside'):
+    """
+    Cria um evento de quando a velocidade radial do objeto `a` em relação a `b` muda de sinal, ou seja, quando `a`
+    passa pelo periastro (de negativa para positiva) ou pelo apoastro (de positiva para negativa) da órbita.
+
+    Parâmetros
+    ----------
+    a, b : objeto de classe simulável, int ou str
+        Objetos, índices ou nomes do satélite e do corpo central.
+    direcao : int, padrão=0
+        1 só para periastros, -1 só para apoastros e 0 para ambos.
+    terminal : bool, padrão=False
+        Se True, a simulação para no instante do evento.
+    nome : str, padrão='apside'
+        Nome do evento, usado nos registros.
+
+    Retorna
+    -------
+    Evento
+    """
+    def funcao(t, s, v, i, j):
+        return np.dot(s[i] - s[j], v[i] - v[j])
+    return Evento(funcao, (a, b), direcao, terminal, nome)
+
+
+def _raiz(g, passo, s, v, t, h, g0, g1, tol=1e-12, max_iter=60):
+    # encontra o instante do evento dentro do passo pelo método de Illinois (regula falsi modificado), refazendo o
+    # passo do início com tamanhos menores; retorna o instante e o estado nele
+    a, b = 0.0, h
+    ga, gb = g0, g1
+    lado = 0
+    sx, vx = s, v
+    x = h
+    for _ in range(max_iter):
+        x = (a * gb - b * ga) / (gb - ga)
+        sx, vx = passo(s, v, x)
+        gx = g(t + x, sx, vx)
+        if gx == 0 or b - a <= tol * abs(h):
+            break
+        if np.sign(gx) == np.sign(gb):
+            b, gb = x, gx
+            if lado == -1:  # mesmo lado duas vezes seguidas, diminui o peso do outro extremo
+                ga /= 2
+            lado = -1
+        else:
+            a, ga = x, gx
+            if lado == 1:
+                gb /= 2
+            lado = 1
+    return t + x, sx, vx
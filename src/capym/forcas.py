@@ -0,0 +1,300 @@
+"""
+Módulo com termos de força que podem ser somados à gravidade de uma simulação. Cada termo calcula as acelerações de
+todos os objetos de uma vez, a partir dos arrays de posições e velocidades, então adicionar física nova custa operações
+com arrays e não loops sobre os objetos.
+
+Os termos são usados em `Sim.configs['forcas']` (lista de termos somados à gravidade) e `Gravidade` também pode
+substituir a soma direta padrão em `Sim.configs['gravidade']`.
+
+Classes
+-------
+Termo
+    Classe base dos termos de força.
+Gravidade
+    Gravidade por soma direta, com suavização opcional.
+ArrastoLinear
+    Arrasto proporcional à velocidade.
+ArrastoQuadratico
+    Arrasto proporcional ao quadrado da velocidade.
+CampoConstante
+    Campo de aceleração uniforme (como a gravidade perto da superfície).
+Molas
+    Molas entre pares de objetos.
+"""
+
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from . import integradores as itg
+
+
+class Termo:
+    """
+    Classe base dos termos de força. Um termo novo só precisa implementar `acel(s, v, m, g)`.
+
+    Métodos
+    -------
+    acel(s, v, m, g)
+        Acelerações de todos os objetos devidas a este termo.
+    """
+    def acel(self, s, v, m, g):
+        """
+        Calcula a aceleração de todos os objetos devida a este termo.
+
+        Parâmetros
+        ----------
+        s, v : ndarray de formato (..., N, 2)
+            Posições e velocidades dos objetos.
+        m : ndarray de formato (N,)
+            Massas dos objetos.
+        g : int ou float
+            Constante da gravitação universal da simulação.
+
+        Retorna
+        -------
+        ndarray de formato (..., N, 2)
+            Aceleração de cada objeto.
+        """
+        raise NotImplementedError
+
+    def _preparar(self, sim):  # versão do termo com referências a objetos trocadas por índices da simulação
+        return self
+
+    def _copiar(self, mapa):  # versão do termo para um fork, com os objetos trocados pelas cópias (`mapa`: id -> cópia)
+        return self
+
+
+class Gravidade(Termo):
+    """
+    Gravidade por soma direta de todos os pares, com suavização opcional (de Plummer) para evitar forças enormes em
+    aproximações muito próximas, comum em nuvens com muitos objetos.
+
+    Com `threads` maior que 1, as linhas da matriz de interações (os objetos que sofrem a força) são divididas em
+    blocos calculados em paralelo por várias threads.
+
+    Atributos
+    ---------
+    suavizacao : float
+        Comprimento de suavização: a força entre dois objetos a distância r é a de r / (r² + suavizacao²)^(3/2).
+    threads : int
+        Número de threads usadas no cálculo (1 para calcular tudo de uma vez, sem blocos).
+    memoria_bloco : int
+        Memória aproximada, em kB, dos arrays temporários de cada bloco de linhas.
+
+    Métodos
+    -------
+    fechar()
+        Encerra as threads do termo, que são criadas de novo se ele voltar a ser usado.
+
+    Ver também
+    ----------
+    integradores.acel_gravitacional
+
+    Notas
+    -----
+    O numpy libera o GIL dentro das operações com arrays, então os blocos realmente rodam em paralelo. Blocos com
+    arrays temporários que cabem no cache de cada núcleo (o padrão é 1 MB) evitam que as threads disputem a memória
+    principal. Vale a pena a partir de algumas centenas de objetos; com poucos, o custo de distribuir os blocos é
+    maior que o ganho.
+
+    As threads são criadas no primeiro cálculo e ficam abertas para os passos seguintes. Use `fechar()` (ou o termo
+    num bloco `with`) para encerrá-las quando ele não for mais usado.
+    """
+    def __init__(self, suavizacao=0.0, threads=1, memoria_bloco=1024):
+        """
+        Parâmetros
+        ----------
+        suavizacao : float, padrão=0.0
+            Comprimento de suavização (0 para a gravidade exata).
+        threads : int ou None, padrão=1
+            Número de threads usadas no cálculo. None para o número de núcleos do computador.
+        memoria_bloco : int, padrão=1024
+            Memória aproximada, em kB, dos arrays temporários de cada bloco de linhas.
+        """
+        self.suavizacao = suavizacao
+        self.threads = (os.cpu_count() or 1) if threads is None else threads
+        self.memoria_bloco = memoria_bloco
+        self._executor = None
+        self._threads_executor = 0  # número de threads do executor atual
+
+    def __getstate__(self):  # o executor não é copiado junto (ex. em `copy.deepcopy` e `pickle`)
+        estado = self.__dict__.copy()
+        estado['_executor'] = None
+        estado['_threads_executor'] = 0
+        return estado
+
+    def fechar(self):
+        """Encerra as threads do termo, esperando os cálculos em andamento."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._threads_executor = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def acel(self, s, v, m, g):
+        n = s.shape[-2]
+        lote = int(np.prod(s.shape[:-2]))  # número de sistemas em lote
+        # cada linha usa cerca de 4 arrays temporários de n elementos (d tem dois) por sistema
+        linhas = max(1, self.memoria_bloco * 1024 // (32 * n * lote))
+        if self.threads <= 1 and linhas >= n:
+            return itg.acel_gravitacional(s, m, g, self.suavizacao)
+
+        a = np.empty(s.shape)
+        blocos = range(0, n, linhas)
+        if self.threads <= 1:
+            for ini in blocos:
+                _acel_linhas(s, m, g, self.suavizacao, ini, ini + linhas, a)
+        else:
+            if self._executor is None or self._threads_executor != self.threads:  # `threads` pode ter mudado
+                self.fechar()
+                self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix='capym-forcas')
+                self._threads_executor = self.threads
+            # list() espera todos os blocos terminarem e repassa erros
+            list(self._executor.map(lambda ini: _acel_linhas(s, m, g, self.suavizacao, ini, ini + linhas, a),
+                                    blocos))
+        return a
+
+
+def _acel_linhas(s, m, g, suavizacao, ini, fim, a):  # aceleração dos objetos ini:fim devida a todos, escrita em `a`
+    si = s[..., ini:fim, :]
+    d = si[..., :, None, :] - s[..., None, :, :]
+    r2 = np.einsum('...k,...k->...', d, d)
+    with np.errstate(divide='ignore'):
+        w = np.where(r2 > 0, (r2 + suavizacao ** 2) ** -1.5, 0.0) * m
+    a[..., ini:fim, :] = -g * (si * w.sum(-1)[..., None] - w @ s)
+
+
+class ArrastoLinear(Termo):
+    """
+    Arrasto proporcional à velocidade: a = -b * v.
+
+    Atributos
+    ---------
+    b : float ou array_like de formato (N,)
+        Coeficiente de arrasto por unidade de massa (em 1/s), um só ou um para cada objeto.
+    """
+    def __init__(self, b):
+        """
+        Parâmetros
+        ----------
+        b : float ou array_like de formato (N,)
+            Coeficiente de arrasto por unidade de massa, um só ou um para cada objeto.
+        """
+        self.b = np.asarray(b, dtype=float)
+
+    def acel(self, s, v, m, g):
+        return -self.b[..., None] * v
+
+
+class ArrastoQuadratico(Termo):
+    """
+    Arrasto proporcional ao quadrado da velocidade, contrário a ela: a = -c * |v| * v.
+
+    Atributos
+    ---------
+    c : float ou array_like de formato (N,)
+        Coeficiente de arrasto por unidade de massa (em 1/m), um só ou um para cada objeto.
+    """
+    def __init__(self, c):
+        """
+        Parâmetros
+        ----------
+        c : float ou array_like de formato (N,)
+            Coeficiente de arrasto por unidade de massa, um só ou um para cada objeto.
+        """
+        self.c = np.asarray(c, dtype=float)
+
+    def acel(self, s, v, m, g):
+        return -(self.c * np.sqrt(np.einsum('...k,...k->...', v, v)))[..., None] * v
+
+
+class CampoConstante(Termo):
+    """
+    Campo de aceleração uniforme, igual para todos os objetos (como a gravidade perto da superfície da Terra).
+
+    Atributos
+    ---------
+    a : ndarray de formato (2,)
+        Vetor aceleração do campo.
+    """
+    def __init__(self, a=(0, -9.8)):
+        """
+        Parâmetros
+        ----------
+        a : array_like de formato (2,), padrão=(0, -9.8)
+            Vetor aceleração do campo.
+        """
+        self.a = np.asarray(a, dtype=float)
+
+    def acel(self, s, v, m, g):
+        return np.broadcast_to(self.a, s.shape)
+
+
+class Molas(Termo):
+    """
+    Molas (lei de Hooke) entre pares de objetos, com amortecimento opcional ao longo da mola.
+
+    Atributos
+    ---------
+    pares : list
+        Pares (a, b) de objetos, índices ou nomes ligados por molas.
+    k : float ou array_like de formato (P,)
+        Constante elástica de cada mola.
+    l0 : float ou array_like de formato (P,)
+        Comprimento natural de cada mola.
+    amortecimento : float ou array_like de formato (P,)
+        Coeficiente de amortecimento de cada mola, que age na velocidade relativa ao longo dela.
+
+    Notas
+    -----
+    As forças são divididas pelas massas, então objetos de massa zero não sentem as molas.
+    """
+    def __init__(self, pares, k=1.0, l0=0.0, amortecimento=0.0):
+        """
+        Parâmetros
+        ----------
+        pares : iterable
+            Pares (a, b) de objetos, índices ou nomes ligados por molas.
+        k : float ou array_like de formato (P,), padrão=1.0
+            Constante elástica de cada mola.
+        l0 : float ou array_like de formato (P,), padrão=0.0
+            Comprimento natural de cada mola.
+        amortecimento : float ou array_like de formato (P,), padrão=0.0
+            Coeficiente de amortecimento de cada mola.
+        """
+        self.pares = [tuple(p) for p in pares]
+        self.k = np.asarray(k, dtype=float)
+        self.l0 = np.asarray(l0, dtype=float)
+        self.amortecimento = np.asarray(amortecimento, dtype=float)
+
+    def _preparar(self, sim):
+        termo = Molas([], self.k, self.l0, self.amortecimento)
+        termo.pares = np.array([(sim._get_index(a), sim._get_index(b)) for a, b in self.pares], dtype=int)
+        return termo
+
+    def _copiar(self, mapa):
+        termo = copy.copy(self)
+        termo.pares = [tuple(mapa.get(id(x), x) for x in par) for par in self.pares]
+        return termo
+
+    def acel(self, s, v, m, g):
+        pares = np.asarray(self.pares, dtype=int).reshape(-1, 2)
+        i, j = pares[:, 0], pares[:, 1]
+        d = s[..., j, :] - s[..., i, :]  # de i para j
+        r = np.sqrt(np.einsum('...k,...k->...', d, d))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            u = np.where(r[..., None] > 0, d / r[..., None], 0.0)  # direção de cada mola
+        dv = v[..., j, :] - v[..., i, :]
+        f = self.k * (r - self.l0) + self.amortecimento * np.einsum('...k,...k->...', dv, u)  # tração em cada mola
+        f = f[..., None] * u
+        forca = np.zeros(s.shape)
+        np.add.at(forca, (..., i, slice(None)), f)
+        np.add.at(forca, (..., j, slice(None)), -f)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(m[:, None] > 0, forca / m[:, None], 0.0)
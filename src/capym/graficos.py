@@ -0,0 +1,413 @@
+"""
+Módulo com a parte gráfica das simulações: animação, exportação de vídeos e objetos gráficos extras (rastros, áreas,
+textos e setas), feitos com a matplotlib.
+
+Este módulo só é importado no primeiro uso de um método gráfico de `sim.Sim` (como `.animar()` ou `.rastro()`), então
+simulações que não desenham nada não carregam a matplotlib. O pyplot (que depende de uma interface gráfica) só é
+carregado por `animar()`, então `Sim.exportar()` também funciona em servidores sem tela. As funções aqui recebem a
+simulação como primeiro parâmetro e são usadas pelos métodos de mesmo nome de `sim.Sim`, onde estão documentadas.
+
+Funções
+-------
+animar(sim, salvar_em='')
+    Anima, salva (opcionalmente) e exibe uma simulação.
+rastro(sim, obj, ...), rastros(sim, objs=None, ...), area_kepler(sim, foco, satelite, ...), texto(sim, texto, ...),
+seta(sim, ...)
+    Adicionam objetos gráficos extras à simulação.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from matplotlib import rc_context, rcParams, style as mpl_style
+from matplotlib.animation import FuncAnimation, writers
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Polygon
+from .sim import formatos_suportados
+
+_trava_rc = threading.Lock()  # trava dos parâmetros de estilo (rcParams) da matplotlib, que são globais
+_exportador = None  # executor das exportações em segundo plano, criado no primeiro uso
+
+
+def _executor():
+    global _exportador
+    if _exportador is None:
+        _exportador = ThreadPoolExecutor(thread_name_prefix='capym-exportar')
+    return _exportador
+
+
+def _simplificar(pontos, tol):
+    # simplificação de linha pelo algoritmo de Douglas–Peucker, retorna os índices dos pontos mantidos
+    n = len(pontos)
+    manter = np.zeros(n, dtype=bool)
+    manter[[0, -1]] = True
+    pilha = [(0, n - 1)]  # trechos ainda não simplificados
+    while pilha:
+        a, b = pilha.pop()
+        if b - a < 2:
+            continue
+        seg = pontos[b] - pontos[a]
+        rel = pontos[a + 1:b] - pontos[a]
+        comp = np.hypot(seg[0], seg[1])
+        if comp > 0:  # distância de cada ponto à reta do trecho
+            d = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / comp
+        else:  # trecho fechado, distância ao ponto inicial
+            d = np.hypot(rel[:, 0], rel[:, 1])
+        i = np.argmax(d)
+        if d[i] > tol:  # divide o trecho no ponto mais distante
+            i += a + 1
+            manter[i] = True
+            pilha += [(a, i), (i, b)]
+    return np.flatnonzero(manter)
+
+
+def _estilo(estilo):  # parâmetros (rcParams) que o estilo muda, resolvidos uma vez só, com a trava
+    with _trava_rc:
+        atuais = dict(rcParams.copy())
+        with mpl_style.context(estilo):
+            return {k: v for k, v in rcParams.copy().items() if v != atuais[k]}
+
+
+def _cores_salvar(rc):  # cores de fundo do estilo para `savefig`, que as lê na hora de salvar, fora da trava
+    return {k[len('savefig.'):]: rc[k] for k in ('savefig.facecolor', 'savefig.edgecolor') if k in rc}
+
+
+def _com_estilo(func_animar, rc, fig):
+    # os artistas de cada frame são criados com o estilo e a trava, e o desenho (a parte demorada) é feito sem ela
+    def func(f):
+        with _trava_rc, rc_context(rc):
+            func_animar(f)
+            # os ticks só são criados ao desenhar, copiando as propriedades do primeiro, que então é criado aqui.
+            # Antes disso é fixada a posição das bordas, também definida só ao desenhar, que recriaria os ticks
+            for ax in fig.axes:
+                for borda in ax.spines.values():
+                    borda.get_spine_transform()
+                for eixo in (ax.xaxis, ax.yaxis):
+                    eixo.get_major_ticks(1)
+                    eixo.get_minor_ticks(1)
+    return func
+
+
+def animar(sim, salvar_em=''):
+    """Anima, salva (opcionalmente) e exibe a simulação `sim` com o pyplot. Ver `Sim.animar()`."""
+    from matplotlib import pyplot as plt  # só aqui, já que a exportação e os plots extras não usam o pyplot
+
+    # configurações
+    rc = _estilo(sim.configs['estilo'])
+    vel = sim.configs['vel']
+    fps = sim.configs['fps']
+
+    if len(sim.tempos) == 0:  # se uma simulação não tiver sido feita ele levanta esse erro
+        raise NameError('Não há dados de simulação neste objeto.'
+                        ' Tente fazer uma simulação usando o método `.simular()`.')
+
+    with _trava_rc, rc_context(rc):
+        ax = plt.gca()
+        func_animar, n_frames = _func_animar(sim, ax)
+    func_animar = _com_estilo(func_animar, rc, ax.figure)
+    print('Compilando vídeo. Duração: {}s, numero de frames: {}'.format(n_frames / fps, n_frames))
+
+    anim = FuncAnimation(ax.figure, func_animar,
+                         frames=n_frames, interval=1000 / (vel * fps))  # faz o loop de animação
+    if salvar_em != '':
+        formato = salvar_em.split('.')[-1]  # retorna o texto após o último ponto do diretório
+        salvar = True
+        if formato not in formatos_suportados:  # checa se o formato está na lista de suportados
+            r = input(f'Este formato de vídeo, \'.{formato}\' pode não ser suportado.'
+                      f' Tentar mesmo assim? [S/N]\n->')
+            if r != 'S':
+                print('Ok, então o vídeo não será salvo.')
+                salvar = False
+
+        try:
+            if salvar:  # não tenta salvar a animação se o usuário esitir, acima
+                writer = writers['ffmpeg']
+                escritor = writer(fps=fps)
+                anim.save(salvar_em, escritor, savefig_kwargs=_cores_salvar(rc))  # salva a animação usando ffmpeg
+                print(f'Vídeo salvo em {salvar_em}')
+        except UnicodeDecodeError:
+            raise UserWarning('Este formato de vídeo não é suportado.'
+                              '\nTente acessar simul.formatos_suportados para ver uma série de opções.'
+                              '\nSugerido: .mp4')
+            # isto serve apenas para substuir o erro do matplolib que é ilegível
+
+    print('Exibindo...')
+    plt.show()
+    plt.close()
+
+
+def _func_animar(sim, ax):  # cria a função que desenha cada frame em `ax` e retorna junto o número de frames
+    xlim = sim.configs['lims'][0]
+    ylim = sim.configs['lims'][1]
+    seguir = sim.configs['seguir']
+    vel = sim.configs['vel']
+    fps = sim.configs['fps']
+    interpolar = sim.configs['interpolar']
+    dados = sim.dados
+    tempos = np.asarray(sim.tempos)
+
+    t_min = tempos[0]  # primeiro instante guardado (maior que 0 se `configs['capacidade']` descartou passos)
+    t_max = tempos[-1] + sim.h  # retoma duração da simulação
+    dt = (1 / fps)  # intervalo entre frames
+
+    cores = []
+    for o in sim.objs:
+        cores.append(o.cor)
+
+    def func_animar(f):  # gerador de função animar. f é o frame atual
+        t = t_min + f * dt * vel  # instante atual
+        if interpolar:
+            p = max(np.searchsorted(tempos, t, side='right') - 1, 0)  # último passo antes do frame atual
+            pos = sim.posicoes_em(t)  # posições interpoladas no instante do frame
+        else:
+            p = np.argmax(tempos >= t)  # passo atual (primeiro instate após o frame atual)
+            pos = np.array(dados[p])  # posições no passo atual
+
+        ax.cla()  # limpa o plot anterior
+        ax.axis('scaled')
+
+        for func in sim._extra_plots:
+            func(sim, ax, t, p, pos)
+
+        if seguir is None:  # configurações de limite responsivo
+            ax.set_xlim(xlim)  # limites fixos
+            ax.set_ylim(ylim)
+        elif seguir in sim.objs:  # se seguir é objeto da simulação
+            ind = sim.objs.index(seguir)  # pega o índice do objeto na lista `objs`
+            ax.set_xlim(xlim + pos[ind, 0])  # limite atualizado de acordo com a posição do objeto
+            ax.set_ylim(ylim + pos[ind, 1])
+        elif isinstance(seguir, int) and seguir < len(sim.objs):  # se for um índice de um objeto
+            ax.set_xlim(xlim + pos[seguir, 0])  # limite atualizado de acordo com a posição do objeto
+            ax.set_ylim(ylim + pos[seguir, 1])
+
+        ax.scatter(pos[:, 0], pos[:, 1], c=cores)  # plota os pontos
+
+    return func_animar, int((t_max - t_min) / (dt * vel))
+
+
+def _exportar(sim, salvar_em, progresso):  # executado na thread de exportação
+    rc = _estilo(sim.configs['estilo'])
+    with _trava_rc, rc_context(rc):
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        func_animar, n_frames = _func_animar(sim, fig.add_subplot())
+    func_animar = _com_estilo(func_animar, rc, fig)
+    cores = _cores_salvar(rc)
+    with _trava_rc:  # fora do estilo, que pode alterar o caminho do ffmpeg
+        escritor = writers['ffmpeg'](fps=sim.configs['fps'])
+        escritor.setup(fig, salvar_em)
+    try:
+        for f in range(n_frames):
+            func_animar(f)
+            escritor.grab_frame(**cores)
+            if progresso is not None:
+                progresso(f + 1, n_frames)
+    finally:
+        with _trava_rc:
+            escritor.finish()
+    return salvar_em
+
+
+def _passos(sim, t0, t1):  # primeiros passos nos instantes t0 e t1 ou depois, sem juntar os blocos de `tempos`
+    ultimo = len(sim.tempos) - 1
+    return min(sim.tempos.buscar(t0), ultimo), min(sim.tempos.buscar(t1), ultimo)
+
+
+def rastro(sim, obj, inicio=0, parar=None, fechar=None, cor='tab:gray', ref=None, tolerancia=0.5):
+    """Adiciona à simulação `sim` o rastro do objeto `obj`. Ver `Sim.rastro()`."""
+    # método que cria função de plotagem de rastro
+    ind = sim._get_index(obj)  # objeto a deixar rastro
+    ref = sim._get_index(ref)  # objeto de referencial para o rastro
+    t0, t1, t_max = sim._extra_plot_time_params(inicio, parar, fechar)
+    # funções de tratamento de inputs
+    cache = {}  # rastro simplificado, calculado uma vez só
+
+    def _rastro_simplificado(sim, ax, p0, p1, p):  # pontos do rastro simplificado até o passo p, relativos a ref
+        caixa = ax.get_window_extent()  # tamanho do gráfico em pixels
+        (x0, x1), (y0, y1) = sim.configs['lims']
+        tol = tolerancia * max((x1 - x0) / caixa.width, (y1 - y0) / caixa.height)  # tolerância em unidades
+        chave = (p0, p1, sim.tempos[p0])  # com `configs['capacidade']`, os índices mudam quando os passos andam
+        if cache.get('chave') != chave or not np.isclose(cache['tol'], tol):
+            rel = sim.dados[p0:p1 + 1, ind]
+            if ref is not None:
+                rel = rel - sim.dados[p0:p1 + 1, ref]
+            cache.update(chave=chave, tol=tol, rel=rel, mantidos=_simplificar(rel, tol))
+        mantidos = cache['mantidos']
+        n = p - p0
+        fim = np.searchsorted(mantidos, n, side='right')  # pontos mantidos até o passo atual
+        return np.vstack((cache['rel'][mantidos[:fim]], cache['rel'][n]))
+
+    def _plotar_rastro(sim, ax, t, p, pos):  # função que plota o gráfico do rastro do momento inicial t0 até o
+        # atual t
+        if t0 < t < t_max and p > 0:  # se o intervalo já tiver passado do t_max, não o plota
+            # em i == 0 pode surgir um erro de lista vazia
+            dados = sim.dados
+            p0, p1 = _passos(sim, t0, t1)  # primeiro passo a exibir o plot e último a ser animado
+            ref_pos_atual = np.zeros(2)
+            if ref is not None:
+                ref_pos_atual = pos[ref]  # posiçao atual do referencial
+
+            if t > t1:  # se o tempo da animação parou  o rastro apra de ser atualizado
+                p = p1
+                ponta = dados[p1, ind] - (0 if ref is None else dados[p1, ref])
+            else:
+                ponta = pos[ind] - (0 if ref is None else pos[ref])  # ponta do rastro, no instante do frame
+
+            if tolerancia is None:
+                abs_pos = dados[p0:p + 1, ind]  # posições do objeto até o momento atual
+                if ref is not None:
+                    ref_pos = dados[p0:p + 1, ref]  # se o referencial não é nulo, retorna as posições do
+                    # referencial até o frame atual
+                else:
+                    ref_pos = np.zeros(2)  # se o referencial é nulo, não retorna nada
+                rel_pos = abs_pos - ref_pos
+            else:  # usa o rastro simplificado, mais o último passo e a ponta
+                rel_pos = _rastro_simplificado(sim, ax, p0, p1, p)
+
+            dists = np.vstack((rel_pos, ponta)) + ref_pos_atual  # calcula as posições em relação a ref e
+            # põe junto a posição atual de ref
+
+            x = dists[:, 0]  # separa os valores x e y de dists
+            y = dists[:, 1]
+
+            linha = Line2D(x, y, c=cor)  # retorna uma linha com o rastro do objeto
+            ax.add_line(linha)  # plota a linha
+
+    sim._extra_plots.append(_plotar_rastro)  # retorna a função de plotagem
+
+
+def rastros(sim, objs=None, inicio=0, parar=None, fechar=None, cor='tab:gray', ref=None, duracao=None,
+            desvanecer=False, max_pontos=1000):
+    """Adiciona à simulação `sim` os rastros de vários objetos num único objeto gráfico. Ver `Sim.rastros()`."""
+    if objs is None:
+        inds = list(range(len(sim.objs)))
+    else:
+        inds = [sim._get_index(o) for o in objs]
+    ref = sim._get_index(ref)
+    t0, t1, t_max = sim._extra_plot_time_params(inicio, parar, fechar)
+    if cor is None:
+        cor = [sim.objs[i].cor for i in inds]
+    cores = np.broadcast_to(to_rgba_array(cor), (len(inds), 4))  # uma cor RGBA para cada rastro
+
+    def _plotar_rastros(sim, ax, t, p, pos):
+        if t0 < t < t_max and p > 0:
+            p0, p1 = _passos(sim, t0, t1)  # primeiro passo a exibir o plot e último a ser animado
+            if t > t1:  # se o tempo da animação parou os rastros param de ser atualizados
+                p = p1
+                ponta = sim.dados[p1, inds] - (0 if ref is None else sim.dados[p1, ref])
+            else:
+                ponta = pos[inds] - (0 if ref is None else pos[ref])
+            if duracao is not None:
+                p0 = max(p0, sim.tempos.buscar(sim.tempos[p] - duracao))
+
+            passo = max(1, -(-(p - p0) // max_pontos))  # pula passos para ter no máximo `max_pontos`
+            passos = np.arange(p - (p - p0) // passo * passo, p + 1, passo)  # alinhados ao passo atual
+            linhas = sim.dados[passos][:, inds]  # (passos, objetos, 2)
+            if ref is not None:
+                linhas = linhas - sim.dados[passos, ref][:, None]
+            linhas = np.concatenate((linhas, ponta[None]))
+            linhas = np.swapaxes(linhas, 0, 1) + (0 if ref is None else pos[ref])  # (objetos, pontos, 2)
+
+            if desvanecer:  # cada rastro é dividido em faixas, cada uma com sua própria opacidade
+                n = linhas.shape[1] - 1  # número de trechos entre pontos
+                faixas = min(16, n)
+                k = n // faixas  # trechos por faixa (os mais antigos que sobram são descartados)
+                partes = np.arange(faixas)[:, None] * k + np.arange(k + 1) + (n - faixas * k)
+                linhas = linhas[:, partes].reshape(-1, k + 1, 2)  # (objetos * faixas, k + 1, 2)
+                rgba = np.repeat(cores, faixas, axis=0)
+                rgba[:, 3] *= np.tile(np.linspace(0, 1, faixas + 1)[1:], len(inds))
+                colecao = LineCollection(linhas, colors=rgba)
+            else:
+                colecao = LineCollection(linhas, colors=cores)
+            ax.add_collection(colecao)
+
+    sim._extra_plots.append(_plotar_rastros)  # retorna a função de plotagem
+
+
+def area_kepler(sim, foco, satelite, inicio=0, parar=None, fechar=None,
+                cor='tab:cyan', opacidade=0.25, cor_borda='tab:blue'):
+    """Adiciona à simulação `sim` a área varrida por `satelite` ao redor de `foco`. Ver `Sim.area_kepler()`."""
+    centro = sim._get_index(foco)
+    sat = sim._get_index(satelite)
+    t0, t1, t_max = sim._extra_plot_time_params(inicio, parar, fechar)
+
+    # funções para tratar input
+
+    def _plotar_area(sim, ax, t, p, pos):
+        if t0 < t < t_max and p > 0:  # se o intervalo já tiver passado, não plota o gráfico
+            dados = sim.dados
+            p0, p1 = _passos(sim, t0, t1)  # primeiro passo a ser exibido e último a ser animado
+            centro_pos_atual = pos[centro]  # posição atual do centro (para referencial)
+
+            if t > t1:  # se o tempo da animação parou para de atualizar o passo para o polígono
+                p = p1
+                ponta = dados[p1, sat] - dados[p1, centro]
+            else:
+                ponta = pos[sat] - pos[centro]  # posição do satélite no instante do frame
+            sat_pos = dados[p0:p + 1, sat]
+            centro_pos = dados[p0:p + 1, centro]  # posições do satélite e centro até o momento atual
+
+            sat_dists = np.vstack((sat_pos - centro_pos, ponta)) + centro_pos_atual  # calcula o rastro do satélite
+
+            pos = sat_dists.tolist()
+            pos.append(centro_pos_atual)  # adiciona o centro ao rastro fechando o polígono
+
+            poligono = Polygon(pos, facecolor=cor, alpha=opacidade, edgecolor=cor_borda)  # cria o polígono
+            ax.add_patch(poligono)  # plota o polígono
+
+    sim._extra_plots.append(_plotar_area)  # retornaa função de plotagem
+
+
+def texto(sim, texto, local=(0, 0), inicio=0, fechar=None, obj=None,
+          cor='w', fonte='serif'):
+    """Adiciona um texto à simulação `sim`. Ver `Sim.texto()`."""
+    ref_ind = sim._get_index(obj)
+    rel_pos = np.array(local)  # posição relativa (se tiver objeto como referencial)
+    t0, _, t_max = sim._extra_plot_time_params(inicio, None, fechar)
+    # funções para tratar input
+
+    def _plotar_texto(sim, ax, t, p, pos):
+        if t0 < t < t_max and p > 0:  # se o intervalo já tiver passado, não plota o gráfico
+            if ref_ind is None:
+                ref = np.zeros(2)  # se não tiver um objeto, não faz anda
+            else:
+                ref = pos[ref_ind]  # posição atual do objeto
+
+            p = rel_pos + ref  # calcula a posição do texto em relação ao objeto
+            ax.text(p[0], p[1], texto, color=cor, fontfamily=fonte)  # plota o texto
+
+    sim._extra_plots.append(_plotar_texto)  # retorna a função de plotagem
+
+
+def seta(sim, pos_a=(0, 0), pos_b=(0, 0), ref_a=None, ref_b=None, inicio=0, fechar=None,
+         largura=0.1, cor='tab:cyan', opacidade=1, cor_borda='tab:blue'):
+    """Adiciona uma seta à simulação `sim`. Ver `Sim.seta()`."""
+    pos_a = np.array(pos_a)
+    pos_b = np.array(pos_b)
+    oa_ind = sim._get_index(ref_a)
+    ob_ind = sim._get_index(ref_b)
+    t0, _, t_max = sim._extra_plot_time_params(inicio, None, fechar)
+
+    def _plotar_seta(sim, ax, t, p, pos):
+        if t0 < t < t_max and p > 0:  # se o intervalo já tiver passado, não plota o gráfico
+            if ref_a is None:  # se ref0 é None, o referencial é 0
+                obj_a = np.zeros(2)
+            else:  # senão, o referencial é a posição atual
+                obj_a = np.array(pos[oa_ind])
+            if ref_b is None:  # idem do sobrescrito
+                obj_b = np.zeros(2)
+            else:  # bis in idem
+                obj_b = np.array(pos[ob_ind])
+
+            p = pos_a + obj_a  # calcula a posição de partida do vetor somado ao referencial
+            delta_p = pos_b + obj_b - p  # o vetor em se partindo de p com referencial a outro objeto
+
+            ax.arrow(p[0], p[1], delta_p[0], delta_p[1],
+                     facecolor=cor, alpha=opacidade, edgecolor=cor_borda, width=largura)
+            # plota o a seta
+
+    sim._extra_plots.append(_plotar_seta)  # retorna a função de plotagem
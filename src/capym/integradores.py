@@ -0,0 +1,226 @@
+"""
+Módulo com os integradores numéricos usados por `sim.Sim`. Todos trabalham sobre arrays com as posições e velocidades
+de todos os objetos de uma vez, de formato (N, 2) (ou com eixos extras no início, para vários sistemas em lote).
+
+Funções
+-------
+acel_gravitacional(s, m, g, suavizacao=0.0)
+    Acelerações gravitacionais de todos os objetos por soma direta.
+passo_euler(s, v, h, acel)
+    Um passo do método de Euler semi-implícito.
+deriva_kepler(q, v, mu, dt)
+    Avança analiticamente objetos em órbitas keplerianas ao redor de um corpo central.
+passo_wh(s, v, h, m, g, central, acel_int)
+    Um passo do mapa simplético de Wisdom–Holman.
+
+Variáveis
+---------
+integradores = ('euler', 'wh')
+    Nomes dos integradores aceitos em `Sim.configs['integrador']`.
+"""
+
+import numpy as np
+
+integradores = ('euler', 'wh')
+
+
+def acel_gravitacional(s, m, g, suavizacao=0.0):
+    """
+    Calcula a aceleração gravitacional de cada objeto devido a todos os outros, por soma direta de todos os pares.
+
+    Parâmetros
+    ----------
+    s : ndarray de formato (..., N, 2)
+        Posições dos objetos.
+    m : ndarray de formato (N,)
+        Massas dos objetos.
+    g : int ou float
+        Constante da gravitação universal.
+    suavizacao : float, padrão=0.0
+        Comprimento de suavização de Plummer, somado em quadratura às distâncias (0 para a gravidade exata).
+
+    Retorna
+    -------
+    ndarray de formato (..., N, 2)
+        Aceleração de cada objeto.
+
+    Notas
+    -----
+    Objetos em posições coincidentes (incluindo o próprio objeto) não interagem entre si.
+    """
+    d = s[..., :, None, :] - s[..., None, :, :]  # d[i, j] = s_i - s_j
+    r2 = np.einsum('...k,...k->...', d, d)
+    with np.errstate(divide='ignore'):
+        w = np.where(r2 > 0, (r2 + suavizacao ** 2) ** -1.5, 0.0) * m  # peso m_j / |d|³ de cada par
+    return -g * (s * w.sum(-1)[..., None] - w @ s)  # soma de w_ij * (s_i - s_j) em j
+
+
+def passo_euler(s, v, h, acel):
+    """
+    Um passo do método de Euler semi-implícito: primeiro atualiza as posições e depois as velocidades, usando a
+    aceleração nas posições novas.
+
+    Parâmetros
+    ----------
+    s, v : ndarray de formato (..., N, 2)
+        Posições e velocidades no início do passo.
+    h : float
+        Tamanho do passo.
+    acel : function
+        Função `acel(s, v)` que retorna as acelerações de todos os objetos.
+
+    Retorna
+    -------
+    tuple de ndarray
+        Posições e velocidades no fim do passo.
+    """
+    s = s + h * v
+    v = v + h * acel(s, v)
+    return s, v
+
+
+def _stumpff(z):  # funções de Stumpff c2 e c3, com série de Taylor perto de z=0 para evitar cancelamento
+    c2 = np.empty_like(z)
+    c3 = np.empty_like(z)
+
+    pos = z > 1e-2  # órbitas elípticas
+    neg = z < -1e-2  # órbitas hiperbólicas
+    zero = ~(pos | neg)
+
+    sz = np.sqrt(z[pos])
+    c2[pos] = (1 - np.cos(sz)) / z[pos]
+    c3[pos] = (sz - np.sin(sz)) / sz ** 3
+    sz = np.sqrt(-z[neg])
+    c2[neg] = (np.cosh(sz) - 1) / -z[neg]
+    c3[neg] = (np.sinh(sz) - sz) / sz ** 3
+    z = z[zero]
+    c2[zero] = 1 / 2 - z / 24 + z ** 2 / 720 - z ** 3 / 40320
+    c3[zero] = 1 / 6 - z / 120 + z ** 2 / 5040 - z ** 3 / 362880
+    return c2, c3
+
+
+def deriva_kepler(q, v, mu, dt, tol=1e-14, max_iter=50):
+    """
+    Avança objetos ao longo das suas órbitas keplerianas ao redor de um corpo central fixo na origem, de forma
+    analítica, usando variáveis universais (vale para órbitas elípticas, parabólicas e hiperbólicas).
+
+    Parâmetros
+    ----------
+    q : ndarray de formato (..., N, 2)
+        Posições relativas ao corpo central.
+    v : ndarray de formato (..., N, 2)
+        Velocidades.
+    mu : float
+        Parâmetro gravitacional do corpo central (G * M).
+    dt : float
+        Intervalo de tempo avançado.
+    tol : float, padrão=1e-14
+        Tolerância relativa na solução da equação de Kepler.
+    max_iter : int, padrão=50
+        Número máximo de iterações para resolver a equação de Kepler.
+
+    Retorna
+    -------
+    tuple de ndarray
+        Posições e velocidades depois de `dt`.
+
+    Notas
+    -----
+    A equação de Kepler em variáveis universais é resolvida pelo método de Laguerre–Conway para todos os objetos ao
+    mesmo tempo, que converge mesmo com passos grandes em relação ao período. Com `mu == 0` os objetos apenas andam
+    em linha reta.
+    """
+    if mu == 0:
+        return q + dt * v, v
+    if np.issubdtype(q.dtype, np.floating):  # em precisão simples a tolerância padrão nunca seria atingida
+        tol = max(tol, 4 * np.finfo(q.dtype).eps)
+
+    sqmu = np.sqrt(mu)
+    r0 = np.sqrt(np.einsum('...k,...k->...', q, q))
+    sigma0 = np.einsum('...k,...k->...', q, v) / sqmu
+    alpha = 2 / r0 - np.einsum('...k,...k->...', v, v) / mu  # inverso do semi-eixo maior
+    beta = 1 - alpha * r0
+
+    x = sqmu * dt / r0  # chute inicial da anomalia universal
+    n = 5  # ordem do método de Laguerre
+    for _ in range(max_iter):
+        z = alpha * x ** 2
+        c2, c3 = _stumpff(z)
+        f = sigma0 * x ** 2 * c2 + beta * x ** 3 * c3 + r0 * x - sqmu * dt
+        df = sigma0 * x * (1 - z * c3) + beta * x ** 2 * c2 + r0
+        ddf = sigma0 * (1 - z * c2) + beta * x * (1 - z * c3)
+        raiz = np.sqrt(np.abs((n - 1) ** 2 * df ** 2 - n * (n - 1) * f * ddf))
+        dx = n * f / (df + np.copysign(raiz, df))
+        x = x - dx
+        if np.all(np.abs(dx) <= tol * np.maximum(np.abs(x), 1)):
+            break
+
+    z = alpha * x ** 2
+    c2, c3 = _stumpff(z)
+    f = 1 - x ** 2 * c2 / r0  # funções f e g de Lagrange
+    g = dt - x ** 3 * c3 / sqmu
+    q1 = f[..., None] * q + g[..., None] * v
+    r = np.sqrt(np.einsum('...k,...k->...', q1, q1))
+    df = sqmu / (r * r0) * x * (z * c3 - 1)
+    dg = 1 - x ** 2 * c2 / r
+    v1 = df[..., None] * q + dg[..., None] * v
+    return q1, v1
+
+
+def passo_wh(s, v, h, m, g, central, acel_int):
+    """
+    Um passo do mapa simplético de Wisdom–Holman em coordenadas heliocêntricas democráticas.
+
+    Cada objeto é avançado analiticamente na sua órbita kepleriana ao redor do corpo central, e as interações entre os
+    outros objetos entram como impulsos ('kicks') de meio passo antes e depois (esquema kick-drift-kick).
+
+    Parâmetros
+    ----------
+    s, v : ndarray de formato (..., N, 2)
+        Posições e velocidades no início do passo.
+    h : float
+        Tamanho do passo.
+    m : ndarray de formato (N,)
+        Massas dos objetos. A massa do corpo central precisa ser positiva.
+    g : int ou float
+        Constante da gravitação universal.
+    central : int
+        Índice do corpo central.
+    acel_int : function
+        Função `acel_int(q, v)` que retorna as acelerações de interação entre os objetos que não são o central, dadas
+        as suas posições relativas ao central e velocidades baricêntricas.
+
+    Retorna
+    -------
+    tuple de ndarray
+        Posições e velocidades no fim do passo.
+
+    Notas
+    -----
+    O erro de energia fica limitado (não cresce ao longo do tempo) enquanto o passo for uma fração razoável do menor
+    período orbital, o que permite passos muito maiores que o de Euler em sistemas planetários.
+    """
+    outros = np.arange(m.shape[0]) != central
+    mc = m[central]
+    mp = m[outros]
+    mt = m.sum()
+
+    s_cm = np.einsum('j,...jk->...k', m, s) / mt  # centro de massa
+    v_cm = np.einsum('j,...jk->...k', m, v) / mt
+    q = s[..., outros, :] - s[..., central, None, :]  # posições heliocêntricas
+    u = v[..., outros, :] - v_cm[..., None, :]  # velocidades baricêntricas
+
+    u = u + h / 2 * acel_int(q, u)  # kick
+    q = q + h / 2 * (np.einsum('j,...jk->...k', mp, u) / mc)[..., None, :]  # salto do movimento do centro
+    q, u = deriva_kepler(q, u, g * mc, h)  # drift
+    q = q + h / 2 * (np.einsum('j,...jk->...k', mp, u) / mc)[..., None, :]
+    u = u + h / 2 * acel_int(q, u)
+    s_cm = s_cm + h * v_cm
+
+    s = np.empty_like(s)
+    v = np.empty_like(v)
+    s[..., central, :] = s_cm - np.einsum('j,...jk->...k', mp, q) / mt  # volta para o referencial original
+    s[..., outros, :] = q + s[..., central, None, :]
+    v[..., central, :] = v_cm - np.einsum('j,...jk->...k', mp, u) / mc
+    v[..., outros, :] = u + v_cm[..., None, :]
+    return s, v
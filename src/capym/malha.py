@@ -0,0 +1,172 @@
+"""
+Módulo com o cálculo da gravidade por partícula-malha ('particle-mesh'), para cenas com muitos objetos distribuídos
+de forma mais ou menos uniforme (nuvens, galáxias), em que a soma direta de todos os pares fica cara demais.
+
+As massas são espalhadas numa grade regular, o campo gravitacional da grade é calculado por convolução com FFT e
+depois interpolado de volta nos objetos, com custo O(N + M log M) por passo para N objetos e M células.
+
+Classes
+-------
+GravidadeMalha
+    Gravidade calculada numa grade, para usar em `Sim.configs['gravidade']`.
+"""
+
+import numpy as np
+
+
+class GravidadeMalha:
+    """
+    Gravidade calculada por partícula-malha: depósito das massas numa grade pelo esquema 'cloud-in-cell' (CIC),
+    convolução com a função de Green por FFT e interpolação CIC das acelerações de volta nos objetos.
+
+    Atributos
+    ---------
+    n : int
+        Número de células da grade em cada direção.
+    lims : tuple ou None
+        Limites ((x0, x1), (y0, y1)) da região da grade. None para se ajustar aos objetos a cada passo.
+    periodico : bool
+        Se True, a região é periódica (os objetos sentem as imagens mais próximas dos outros). Se False, a região é
+        isolada, sem imagens.
+    margem : float
+        Fração do tamanho da região somada em cada lado quando ela se ajusta aos objetos.
+
+    Métodos
+    -------
+    acel(s, v, m, g)
+        Acelerações gravitacionais de todos os objetos.
+
+    Ver também
+    ----------
+    sim.Sim
+    integradores.acel_gravitacional
+
+    Notas
+    -----
+    A força é a mesma da soma direta (proporcional ao inverso do quadrado da distância), então a função de Green
+    usada na convolução é a própria aceleração de uma massa unitária, em vez da solução da equação de Poisson em
+    duas dimensões. Com a região isolada a grade é dobrada em cada direção e preenchida com zeros, o que elimina as
+    imagens periódicas da FFT (método de Hockney–Eastwood).
+
+    A resolução é a de uma célula: objetos mais próximos que isso sentem uma força suavizada, e objetos na mesma
+    célula praticamente não interagem. Com `lims` fixo e região isolada, objetos fora da região são tratados como se
+    estivessem na borda.
+    """
+    def __init__(self, n=128, lims=None, periodico=False, margem=0.05):
+        """
+        Parâmetros
+        ----------
+        n : int, padrão=128
+            Número de células da grade em cada direção (potências de 2 são mais rápidas).
+        lims : tuple ou None, padrão=None
+            Limites ((x0, x1), (y0, y1)) da região da grade. None para se ajustar aos objetos a cada passo.
+            As células são sempre quadradas, do tamanho do maior lado.
+        periodico : bool, padrão=False
+            Se True, a região é periódica. Se False, é isolada.
+        margem : float, padrão=0.05
+            Fração do tamanho da região somada em cada lado quando ela se ajusta aos objetos.
+
+        Raise
+        -----
+        ValueError
+            Região periódica sem limites definidos.
+        """
+        if periodico and lims is None:
+            raise ValueError('Uma região periódica precisa de limites definidos em `lims`.')
+        self.n = n
+        self.lims = lims
+        self.periodico = periodico
+        self.margem = margem
+        self._nucleo = None  # transformadas da função de Green, calculadas na primeira vez
+        self._chave_nucleo = None
+
+    def _nucleos(self):  # transformadas das componentes da aceleração de uma massa unitária, com células unitárias
+        chave = (self.n, self.periodico)
+        if self._chave_nucleo != chave:
+            n = self.n
+            tam = n if self.periodico else 2 * n
+            i = np.arange(tam)
+            if self.periodico:  # imagem mais próxima
+                d = (i + n // 2) % n - n // 2
+            else:  # distâncias positivas e negativas em torno da origem
+                d = np.where(i < n, i, i - tam)
+            dx, dy = np.meshgrid(d, d, indexing='ij')
+            r2 = (dx ** 2 + dy ** 2).astype(float)
+            with np.errstate(divide='ignore'):
+                w = np.where(r2 > 0, r2 ** -1.5, 0.0)
+            if self.periodico and n % 2 == 0:  # a meia caixa é ambígua, zera para manter a simetria
+                w[n // 2, :] = 0
+                w[:, n // 2] = 0
+            self._nucleo = (np.fft.rfft2(-dx * w), np.fft.rfft2(-dy * w))
+            self._chave_nucleo = chave
+        return self._nucleo
+
+    def _regiao(self, s):  # origem e tamanho das células da grade
+        if self.lims is not None:
+            (x0, x1), (y0, y1) = self.lims
+            return np.array([x0, y0], dtype=float), max(x1 - x0, y1 - y0) / self.n
+        mn = s.min(0)
+        mx = s.max(0)
+        lado = max((mx - mn).max(), 1e-12) * (1 + 2 * self.margem)
+        return (mn + mx) / 2 - lado / 2, lado / self.n
+
+    def acel(self, s, v, m, g):
+        """
+        Calcula a aceleração gravitacional de todos os objetos pela grade.
+
+        Parâmetros
+        ----------
+        s : ndarray de formato (..., N, 2)
+            Posições dos objetos.
+        v : ndarray de formato (..., N, 2)
+            Velocidades dos objetos (não usadas).
+        m : ndarray de formato (N,)
+            Massas dos objetos.
+        g : int ou float
+            Constante da gravitação universal.
+
+        Retorna
+        -------
+        ndarray de formato (..., N, 2)
+            Aceleração de cada objeto.
+        """
+        if s.ndim > 2:  # sistemas em lote são calculados um de cada vez
+            a = np.empty(s.shape)
+            for k in np.ndindex(s.shape[:-2]):
+                a[k] = self.acel(s[k], None, m, g)
+            return a
+
+        n = self.n
+        tam = n if self.periodico else 2 * n
+        origem, dx = self._regiao(s)
+        x = (s - origem) / dx - 0.5  # posição em unidades de célula, relativa aos centros
+        i0 = np.floor(x).astype(int)
+        f = x - i0  # fração da distância até a próxima célula
+        if self.periodico:
+            i0 %= n
+            i1 = (i0 + 1) % n
+        else:  # fora da região, vai para a borda
+            f = np.where(i0 < 0, 0.0, np.where(i0 >= n - 1, 1.0, f))
+            i0 = np.clip(i0, 0, n - 2)
+            i1 = i0 + 1
+
+        # pesos CIC de cada objeto nas quatro células vizinhas
+        cantos = [(i0[:, 0], i0[:, 1], (1 - f[:, 0]) * (1 - f[:, 1])),
+                  (i1[:, 0], i0[:, 1], f[:, 0] * (1 - f[:, 1])),
+                  (i0[:, 0], i1[:, 1], (1 - f[:, 0]) * f[:, 1]),
+                  (i1[:, 0], i1[:, 1], f[:, 0] * f[:, 1])]
+
+        massa = np.zeros(tam * tam)
+        for ix, iy, w in cantos:
+            massa += np.bincount(ix * tam + iy, w * m, tam * tam)
+        massa = np.fft.rfft2(massa.reshape(tam, tam))
+
+        nx, ny = self._nucleos()
+        campo = [np.fft.irfft2(massa * k, (tam, tam)).ravel() for k in (nx, ny)]  # aceleração em cada célula
+
+        a = np.zeros(s.shape)
+        for ix, iy, w in cantos:
+            j = ix * tam + iy
+            a[:, 0] += w * campo[0][j]
+            a[:, 1] += w * campo[1][j]
+        return g / dx ** 2 * a
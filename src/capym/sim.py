@@ -14,16 +14,79 @@ formatos_suportados = ('3g2', '3pg', 'amv', 'asf', 'avi', 'dirac', 'drc', 'flv',
     Lista de formatos suportados para serem salvos. Outros podem funcionar mas não garanto.
 """
 
-from src.capym import coisas as csa
+import copy
+import json
+import time
+from collections import OrderedDict
 import numpy as np
-from matplotlib import pyplot as plt
-from matplotlib.animation import FuncAnimation, writers
+from . import coisas as csa
+from . import eventos as evt
+from . import integradores as itg
+from . import trajetoria as trj
 
 formatos_suportados = ('3g2', '3pg', 'amv', 'asf', 'avi', 'dirac', 'drc', 'flv', 'gif', 'm4v', 'mp2', 'mp3', 'mp4',
                        'mjpeg', 'mpeg', 'mpegets', 'mov', 'mkv', 'mxf', 'mxf_d10', 'mxf_opatom', 'nsv', 'null', 'ogg',
                        'ogv', 'rm', 'roq', 'vob', 'webm')
 
 
+def _graficos():  # parte gráfica, importada só no primeiro uso porque carrega a matplotlib
+    from . import graficos
+    return graficos
+
+
+def _configs_padrao():  # dicionário de configurações padrão da simulação
+    return {'estilo': 'dark_background',  # estilo de fundo
+            'seguir': None,  # objeto seguido
+            'lims': ((-5, 5), (-5, 5)),  # limites de enquadramento
+            'fps': 30, 'vel': 1,
+            'G': 1,  # Constante da gravitação universal; real = 6.6708e-11; 0 para sem gravidade
+            'integrador': 'euler',  # ver `integradores.integradores`
+            'central': None,  # corpo central do integrador 'wh' (None para o mais massivo)
+            'gravar_vel': True,  # guarda as velocidades em `vels`, usadas na interpolação
+            'interpolar': True,  # interpola posições entre os passos na animação
+            'memoria_checkpoints': 64,  # memória máxima (em MB) dos checkpoints de `estado_em`
+            'intervalo_checkpoints': 1000,  # passos entre checkpoints guardados por `estado_em`
+            'gravidade': None,  # cálculo da gravidade: None para soma direta, ou ex. `malha.GravidadeMalha()`
+            'forcas': [],  # outros termos de força somados à gravidade, ver `forcas`
+            'cache': None,  # cache em disco dos resultados de `simular`, ex. `cache.CacheResultados()`
+            'precisao': 'float64',  # tipo dos arrays do estado durante a integração
+            'precisao_dados': None,  # tipo de `dados` e `vels`; None para o mesmo de 'precisao'
+            'capacidade': None,  # número máximo de passos guardados em `dados` (os últimos); None para todos
+            'publicar': None,  # publica o estado em memória compartilhada, ex. `compartilhado.Publicador()`
+            'compressao': None}  # erro máximo de `dados` e `vels` comprimidos; None para não comprimir
+
+
+# configurações guardadas por `Sim.salvar()`: as que são valores simples. As que são objetos ('gravidade', 'forcas',
+# 'cache' e 'publicar') não são guardadas
+_CONFIGS_SALVAS = ('estilo', 'seguir', 'lims', 'fps', 'vel', 'G', 'integrador', 'central', 'gravar_vel', 'interpolar',
+                   'memoria_checkpoints', 'intervalo_checkpoints', 'precisao', 'precisao_dados', 'capacidade',
+                   'compressao')
+
+
+def _linhas(vetores):  # array (N, 2) somente leitura com os vetores como linhas, sem cópia, ou None se não der
+    # só é possível quando os vetores já são linhas igualmente espaçadas de um mesmo array de float64, como depois de
+    # `add_arrays()` ou de uma simulação, que atribuem aos objetos as linhas dos arrays de estado
+    if not vetores or not all(isinstance(x, np.ndarray) for x in vetores):
+        return None
+    x0 = vetores[0]
+    dono = x0.base
+    if dono is None or x0.dtype != np.float64 or x0.shape != (2,):
+        return None
+    inicio = x0.__array_interface__['data'][0]
+    passo = vetores[1].__array_interface__['data'][0] - inicio if len(vetores) > 1 else x0.nbytes
+    for i, x in enumerate(vetores):
+        if (x.base is not dono or x.dtype != x0.dtype or x.shape != x0.shape or x.strides != x0.strides
+                or x.__array_interface__['data'][0] != inicio + i * passo):
+            return None
+    return np.lib.stride_tricks.as_strided(x0, (len(vetores), 2), (passo, x0.strides[0]), writeable=False)
+
+
+def _cor_str(cor):  # transforma cores em tuplas RGB(A) de 0 a 1 no formato hexadecimal, para salvar como texto
+    if isinstance(cor, str):
+        return cor
+    return '#' + ''.join(f'{int(round(c * 255)):02x}' for c in cor)
+
+
 class Sim:
     """
     Classe na qual ficam salvos os dados e configurações de simulação. É possível herdar valores já configurados, copiar
@@ -34,40 +97,95 @@ class Sim:
     ---------
     objs : list, padrão=[]
         Lista com objetos adiconados à simulação.
-    dados : list, padrão=[]
-        Lista com posições dos objetos a cada iteração.
-    tempos : list, padrão=[]
-        Lista com instantes de cada iteração.
+    dados : trajetoria.Trajetoria, trajetoria.TrajetoriaCircular, trajetoria.TrajetoriaComprimida ou list, padrão=[]
+        Posições dos objetos a cada iteração (se comporta como um array somente leitura de formato (passos, N, 2)).
+    vels : trajetoria.Trajetoria, trajetoria.TrajetoriaCircular, trajetoria.TrajetoriaComprimida ou list, padrão=[]
+        Velocidades dos objetos a cada iteração (se `configs['gravar_vel']`).
+    tempos : trajetoria.Trajetoria, trajetoria.TrajetoriaCircular ou list, padrão=[]
+        Instantes de cada iteração.
     h : float, padrão=0.01
         Passo entre ieterações (em segundos).
-    configs : dict, padrão={'estilo': 'dark_background', 'seguir': -1, 'xlim': (-5, 5), 'ylim': (-5, 5), 'fps': 30,
-                            'vel': 1, 'G': 1}
+    ocorrencias : list, padrão=[]
+        Eventos detectados pelas simulações, como `eventos.Ocorrencia` (instante, nome e estado).
+    configs : dict, padrão={'estilo': 'dark_background', 'seguir': None, 'lims': ((-5, 5), (-5, 5)), 'fps': 30,
+                            'vel': 1, 'G': 1, 'integrador': 'euler', 'central': None, 'gravar_vel': True,
+                            'interpolar': True, 'memoria_checkpoints': 64, 'intervalo_checkpoints': 1000,
+                            'gravidade': None, 'forcas': [], 'cache': None, 'precisao': 'float64',
+                            'precisao_dados': None, 'capacidade': None, 'publicar': None, 'compressao': None}
         Configurações extras da simulação. Sendo elas:
         estilo: estilo de plot da matplotlib;
-        seguir: ínidce do objeto que se o enquadramento irá seguir (negativo para nenhum);
+        seguir: objeto, ínidce do objeto que se o enquadramento irá seguir (None para nenhum);
         lims: limites de enquadramento;
         fps: fps;
         vel: velocidade de reprodução;
         G: constante da gravitação universal (0 para sem gravidade);
+        integrador: 'euler' ou 'wh' (Wisdom–Holman, para sistemas planetários);
+        central: objeto, índice ou nome do corpo central do integrador 'wh' (None para o mais massivo);
+        gravar_vel: se as velocidades de cada passo são guardadas em `vels`;
+        interpolar: se a animação interpola as posições entre os passos, deixando o fps independente de `h`;
+        memoria_checkpoints: memória máxima, em MB, dos checkpoints guardados por `estado_em`;
+        intervalo_checkpoints: número de passos entre os checkpoints guardados por `estado_em`;
+        gravidade: None para a soma direta de todos os pares, ou um objeto com o método `acel(s, v, m, g)`, como
+            `malha.GravidadeMalha` para muitos objetos ou `forcas.Gravidade` para a gravidade suavizada;
+        forcas: lista de outros termos de força (ver o módulo `forcas`) somados à gravidade, como arrasto e molas;
+        cache: None, ou um `cache.CacheResultados` onde os resultados de `simular` são guardados e reaproveitados;
+        precisao: tipo de ponto flutuante do estado durante a integração ('float64' ou 'float32');
+        precisao_dados: tipo de ponto flutuante de `dados` e `vels` (None para o mesmo de 'precisao'), ex. 'float32'
+            para guardar e animar com metade da memória mantendo a integração em 'float64';
+        capacidade: None para guardar todos os passos, ou o número máximo de passos guardados em `dados`, `vels` e
+            `tempos`, que passam a ser `trajetoria.TrajetoriaCircular` com só os últimos passos (memória constante em
+            simulações sem fim, como proteções de tela);
+        publicar: None, ou um `compartilhado.Publicador` onde `simular` publica o estado atual e os últimos passos,
+            para outros processos lerem em memória compartilhada;
+        compressao: None, ou o erro máximo de cada componente de `dados` e `vels`, que passam a ser
+            `trajetoria.TrajetoriaComprimida` (ex. 1e-4 para guardar com até cerca de 8 vezes menos memória). Com ela,
+            'precisao_dados' não vale: os passos são comprimidos direto do estado da integração e lidos em float64, com
+            erro de no máximo 'compressao'. Não pode ser usada junto com 'capacidade';
 
     Métodos
     -------
     add_obj(*args)
         Adicionar objetos ou listan de objetos à simulação.
         (automaticamente atualiza a velociade orbital dos objetos em órbita)
+    add_arrays(s, v=None, m=None, nomes=None, cores=None)
+        Adiciona vários objetos de uma vez a partir de arrays.
+    de_arrays(s, v=None, m=None, nomes=None, cores=None)
+        Cria uma simulação nova a partir de arrays (método de classe).
+    estado()
+        Retorna posições, velocidades e massas atuais como arrays.
+    salvar(caminho)
+        Salva objetos e dados num arquivo `.npz`.
+    carregar(caminho)
+        Cria uma simulação a partir de um arquivo `.npz` (método de classe).
+    fork()
+        Cria uma cópia independente da simulação no estado atual, compartilhando os dados já simulados.
     iterar()
-        Iteração simples usando método de Euler.
-    simulaar(t, h=0.01)
-        Executa diversas iterações e rotorna uma lista de passos.
+        Iteração simples usando o integrador configurado.
+    simulaar(t, h=0.01, orcamento=None, cancelar=None, progresso=None, eventos=None)
+        Executa diversas iterações e rotorna uma lista de passos. Pode ser limitada por tempo, cancelada ou parada
+        por eventos.
+    simular_async(t, h=0.01, progresso=None, eventos=None, passos_bloco=1000, executor=None)
+        Versão assíncrona de `simular`, que calcula em blocos sem travar o loop do asyncio.
+    passos_async(t, h=0.01, progresso=None, eventos=None, passos_bloco=1000, executor=None)
+        Iterador assíncrono que simula e entrega cada passo guardado.
+    estado_em(t)
+        Estado dos objetos num instante qualquer, calculado sob demanda a partir de checkpoints.
+    posicoes_em(t)
+        Posições dos objetos em instantes quaisquer, interpoladas entre os passos.
     animar(salvar_em='')
         Anima, exibe e salva simulações.
+    exportar(salvar_em, progresso=None)
+        Salva a animação em segundo plano, retornando um `Future`.
     reset()
         Reinicia configurações e dados da simulação (limpa objetos).
 
     Outros métodos
     --------------
-    rastro(obj, inicio=0, parar=None, fechar=none, cor='tab:gray', ref=None)
+    rastro(obj, inicio=0, parar=None, fechar=none, cor='tab:gray', ref=None, tolerancia=0.5)
         Faz com que o objeto `obj` exiba o rastro simulado.
+    rastros(objs=None, inicio=0, parar=None, fechar=None, cor='tab:gray', ref=None, duracao=None,
+            desvanecer=False, max_pontos=1000)
+        Exibe os rastros de vários objetos (ou de todos) num único objeto gráfico.
     area_kepler(obj_central, satelite, inicio=0, parar=None, fechar=None,
                 cor='tab:cyan', opacidade=0.25, cor_borda='tab:blue')
         Faz com que o objeto `satelite` forme uma setor para ilustrar a segunda lei de Kepler.
@@ -115,21 +233,30 @@ class Sim:
         if isinstance(herdar, Sim):  # possibilita herdar as configurações de outra simulação
             self.objs = herdar.objs
             self.dados = herdar.dados
+            self.vels = herdar.vels
             self.tempos = herdar.tempos
             self.h = herdar.h
             self.configs = herdar.configs
+            self._t = herdar._t
+            self._inicial = herdar._inicial
+            self._t_inicial = herdar._t_inicial
+            self._checkpoints = OrderedDict()
+            self._chave_checkpoints = None
+            self.ocorrencias = herdar.ocorrencias
             self._extra_plots = []
         else:
             self.objs = []  # lista de objetos inclusos na simulação
             self.dados = []  # dados gerados
+            self.vels = []  # velocidades a cada passo
             self.tempos = []  # insatantes de cada passo
             self.h = 0.01  # passo da simulação (padrão como 0.01)
-            self.configs = {'estilo': 'dark_background',  # estilo de fundo
-                            'seguir': None,  # objeto seguido
-                            'lims': ((-5, 5), (-5, 5)),  # limites de enquadramento
-                            'fps': 30, 'vel': 1,
-                            'G': 1}  # Constante da gravitação universal; real = 6.6708e-11; 0 para sem gravidade
-            # dicionário de configurações da simulação
+            self.configs = _configs_padrao()  # dicionário de configurações da simulação
+            self._t = 0.0  # instante do estado atual dos objetos
+            self._inicial = None  # estado em `_t_inicial`, ponto de partida de `estado_em`
+            self._t_inicial = 0.0  # instante do estado inicial (o do fork, numa simulação criada por `fork()`)
+            self._checkpoints = OrderedDict()  # cache LRU de estados intermediários de `estado_em`
+            self._chave_checkpoints = None  # configuração com que os checkpoints foram calculados
+            self.ocorrencias = []  # eventos detectados durante as simulações
 
             self._extra_plots = []  # lisat de funções plotando certas estruturas (como rastros)
 
@@ -169,21 +296,293 @@ class Sim:
                 else:
                     print(f'{obj}, não é um objeto simulável')
 
-    def _ar(self, obj):
-        gc = self.configs['G']  # pega o valor da constante da gravitação universal
-        ar = np.zeros(2)
-        for n in self.objs:
-            if n is not obj:
-                d = obj.s - n.s  # vetor distancia
-                ar += - np.array(gc * n.m / (d[0] ** 2 + d[1] ** 2) * d / np.linalg.norm(d))
-                # aceleração gravitacional, multiplicada pelo versor da distância
-                # aqui se colocaria outras forças a serem adicionadas a `ar`
-        return ar
+    def add_arrays(self, s, v=None, m=None, nomes=None, cores=None):
+        """
+        Método para adicionar de uma vez vários objetos a partir de arrays do numpy, sem precisar criar cada partícula
+        separadamente.
+
+        Parâmetros
+        ----------
+        s : array_like de formato (N, 2)
+            Posições dos N objetos.
+        v : array_like de formato (N, 2) ou None, padrão=None
+            Velocidades dos objetos. None para todos parados.
+        m : array_like de formato (N,), int, float ou None, padrão=None
+            Massas dos objetos. Um único número vale para todos e None equivale a massa 1.0.
+        nomes : lista de str ou None, padrão=None
+            Nomes dos objetos. Ver `coisas.Particula`.
+        cores : lista de str, str ou None, padrão=None
+            Cores dos objetos. Uma única string vale para todos. Ver `coisas.Particula`.
+
+        Raise
+        -----
+        ValueError
+            Arrays de formatos incompatíveis.
+
+            Levantado quando `s`, `v`, `m`, `nomes` ou `cores` não descrevem o mesmo número de objetos.
+
+        Notas
+        -----
+        Quando `s` e `v` já são arrays de float, as posições e velocidades de cada partícula criada são visões (*views*)
+        das linhas desses arrays, ou seja, não há cópia. Os arrays originais não são modificados pela simulação, já que
+        a cada passo os vetores das partículas são substituídos, não alterados.
+
+        Ver também
+        ----------
+        Sim.add_obj()
+        Sim.de_arrays()
+        Sim.estado()
+        """
+        s = np.asarray(s, dtype=float)
+        n = len(s)
+        v = np.zeros((n, 2)) if v is None else np.asarray(v, dtype=float)
+        m = np.broadcast_to(np.asarray(1.0 if m is None else m, dtype=float), (n,))
+        nomes = [''] * n if nomes is None else list(nomes)
+        cores = [cores or 'tab:blue'] * n if cores is None or isinstance(cores, str) else list(cores)
+
+        if s.shape != (n, 2) or v.shape != (n, 2) or len(nomes) != n or len(cores) != n:
+            raise ValueError('Arrays de formatos incompatíveis.')
+
+        for i in range(n):
+            obj = csa.Particula(m=m[i].item(), nome=nomes[i], cor=cores[i])
+            obj.s = s[i]  # visões das linhas, sem cópia
+            obj.v = v[i]
+            obj._sim = self
+            self.objs.append(obj)
+
+    @classmethod
+    def de_arrays(cls, s, v=None, m=None, nomes=None, cores=None):
+        """
+        Cria uma simulação nova já com os objetos descritos pelos arrays.
+
+        Para os parâmetros, ver `Sim.add_arrays()`.
+
+        Retorna
+        -------
+        Sim
+            Simulação com configurações padrão e os objetos adicionados.
+        """
+        sim = cls()
+        sim.add_arrays(s, v, m, nomes, cores)
+        return sim
+
+    def estado(self):
+        """
+        Retorna o estado atual de todos os objetos da simulação como arrays.
+
+        Retorna
+        -------
+        tuple de ndarray
+            Posições (N, 2), velocidades (N, 2) e massas (N,), na ordem em que os objetos foram adicionados.
+
+        Notas
+        -----
+        Cada objeto guarda seus próprios vetores, mas depois de `add_arrays()` ou de uma simulação eles são linhas de
+        um mesmo array. Nesses casos as posições e velocidades retornadas são visões somente leitura desse array, sem
+        cópia; caso contrário (ex. objetos adicionados um a um, ou `configs['precisao']` diferente de float64) são
+        cópias. As massas são sempre copiadas. Use `np.array(...)` para ter arrays próprios e alteráveis. Já os
+        atributos `.dados` e `.tempos` são trajetórias (somente leitura) que podem ser indexadas diretamente, sem cópia.
+        """
+        s = _linhas([o.s for o in self.objs])
+        if s is None:
+            s = np.array([o.s for o in self.objs], dtype=float).reshape(-1, 2)
+        v = _linhas([o.v for o in self.objs])
+        if v is None:
+            v = np.array([o.v for o in self.objs], dtype=float).reshape(-1, 2)
+        m = np.array([o.m for o in self.objs], dtype=float)
+        return s, v, m
+
+    def salvar(self, caminho):
+        """
+        Salva o estado atual dos objetos, seus nomes e cores, as configurações e os dados já simulados num arquivo
+        `.npz` do numpy.
+
+        Parâmetros
+        ----------
+        caminho : str
+            Diretório do arquivo a ser salvo. Se não terminar em '.npz', o numpy adiciona a extensão.
+
+        Notas
+        -----
+        São guardadas as configurações com valores simples (como 'integrador', 'central', 'G', 'precisao' e as da
+        animação), com `seguir` e `central` pelo índice do objeto. As que são objetos ('gravidade', 'forcas', 'cache'
+        e 'publicar') e estilos da matplotlib que não sejam texto não são guardados, e precisam ser configurados de
+        novo depois de `carregar()`.
+
+        Ver também
+        ----------
+        Sim.carregar()
+        """
+        s, v, m = self.estado()
+        configs = {}
+        for k in _CONFIGS_SALVAS:
+            valor = self.configs[k]
+            if k in ('seguir', 'central'):
+                valor = self._get_index(valor)
+            try:
+                configs[k] = json.loads(json.dumps(valor))  # só valores representáveis em JSON
+            except (TypeError, ValueError):
+                pass
+        np.savez(caminho, s=s, v=v, m=m,
+                 nomes=np.array([o.nome for o in self.objs], dtype=str),
+                 cores=np.array([_cor_str(o.cor) for o in self.objs], dtype=str),
+                 dados=np.asarray(self.dados, dtype=float), vels=np.asarray(self.vels, dtype=float),
+                 tempos=np.asarray(self.tempos, dtype=float),
+                 h=self.h, G=self.configs['G'], configs=json.dumps(configs))
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Cria uma simulação a partir de um arquivo salvo com `Sim.salvar()`.
+
+        Parâmetros
+        ----------
+        caminho : str
+            Diretório do arquivo `.npz`.
+
+        Retorna
+        -------
+        Sim
+            Simulação com os objetos, o passo `h`, as configurações e os dados que foram salvos. Ver as notas de
+            `Sim.salvar()` sobre as configurações que não são guardadas.
+
+        Ver também
+        ----------
+        Sim.salvar()
+        """
+        with np.load(caminho) as arq:
+            sim = cls()
+            sim.configs['G'] = arq['G'].item()
+            sim.h = arq['h'].item()
+            sim.add_arrays(arq['s'], arq['v'], arq['m'], arq['nomes'].tolist(), arq['cores'].tolist())
+            if 'configs' in arq.files:  # arquivos de versões antigas só têm `G`
+                configs = json.loads(arq['configs'].item())
+                if 'lims' in configs:
+                    configs['lims'] = tuple(map(tuple, configs['lims']))
+                for k in ('seguir', 'central'):  # de volta aos objetos
+                    if configs.get(k) is not None:
+                        configs[k] = sim.objs[configs[k]]
+                sim.configs.update(configs)
+            if len(arq['tempos']) > 0:  # só recupera os dados se alguma simulação tiver sido feita
+                sim.dados = trj.Trajetoria([arq['dados']])
+                sim.tempos = trj.Trajetoria([arq['tempos']])
+                if len(arq['vels']) > 0:
+                    sim.vels = trj.Trajetoria([arq['vels']])
+                sim._t = sim.tempos[-1] + sim.h
+        return sim
+
+    def fork(self):
+        """
+        Cria uma cópia independente da simulação no estado atual, para continuar por outro caminho (com outras
+        configurações ou objetos perturbados, por exemplo) sem alterar esta e sem simular de novo desde o início.
+
+        Retorna
+        -------
+        Sim
+            Simulação com cópias dos objetos, das configurações e dos plots extras, e com os mesmos dados já simulados.
+
+        Notas
+        -----
+        Diferente de `Sim(herdar=...)`, que usa os mesmos objetos e configurações (então simular uma altera a outra),
+        aqui só os vetores de posição e velocidade dos objetos são copiados. Os passos já simulados em `dados`,
+        `vels` e `tempos` são compartilhados sem cópia: eles nunca são alterados, e novas simulações em qualquer uma
+        das duas só adicionam blocos novos à sua própria trajetória. Assim é barato criar muitos forks a partir do
+        mesmo instante. A exceção é com `configs['capacidade']`, em que os últimos passos guardados são copiados.
+
+        Referências a objetos nas configurações (`seguir`, `central` e termos de `forcas` como `forcas.Molas`) passam
+        a apontar para as cópias.
+
+        Como o fork pode ser perturbado, `estado_em()` nele parte do estado do próprio fork no instante em que foi
+        criado, e só aceita instantes a partir dele.
+
+        Exemplos
+        --------
+        base.simular(100)
+        for dv in np.linspace(-0.1, 0.1, 20):
+            ramo = base.fork()
+            ramo.objs[1].v = ramo.objs[1].v + (0, dv)
+            ramo.simular(50)
+
+        Ver também
+        ----------
+        Sim.__init__()
+        """
+        novo = copy.copy(self)
+        novo.objs = []
+        for o in self.objs:
+            c = copy.copy(o)
+            c.s = np.array(o.s, dtype=float)  # vetores próprios, para não mexer nos do original
+            c.v = np.array(o.v, dtype=float)
+            c._sim = novo
+            novo.objs.append(c)
+        novo.configs = dict(self.configs)
+        mapa = {id(o): c for o, c in zip(self.objs, novo.objs)}
+        # adicionar forças no fork não muda o original, e os termos passam a se referir às cópias dos objetos
+        novo.configs['forcas'] = [termo._copiar(mapa) for termo in self.configs['forcas']]
+        for k in ('seguir', 'central'):  # referências a objetos passam a apontar para as cópias
+            if any(self.configs[k] is o for o in self.objs):
+                novo.configs[k] = novo.objs[self._get_index(self.configs[k])]
+        # o fork pode ser perturbado, então `estado_em` parte do estado dele no instante do fork, sem checkpoints
+        novo._inicial = None
+        novo._t_inicial = self._t
+        novo._checkpoints = OrderedDict()
+        novo._chave_checkpoints = None
+        for k in ('dados', 'vels', 'tempos'):  # trajetórias circulares são alteradas no lugar, então são copiadas
+            traj = getattr(self, k)
+            if isinstance(traj, trj.TrajetoriaCircular):
+                setattr(novo, k, trj.TrajetoriaCircular(traj.capacidade, [traj]))
+        novo.ocorrencias = list(self.ocorrencias)
+        novo._extra_plots = list(self._extra_plots)
+        return novo
+
+    def _precisoes(self):  # tipos do estado na integração e dos dados guardados
+        precisao = np.dtype(self.configs['precisao'])
+        dados = self.configs['precisao_dados']
+        return precisao, precisao if dados is None else np.dtype(dados)
+
+    def _ar(self, s, v, m, forcas=()):  # acelerações de todos os objetos, dado o estado como arrays
+        gravidade = self.configs['gravidade']
+        if gravidade is None:  # soma direta
+            a = itg.acel_gravitacional(s, m, self.configs['G'])
+        else:
+            a = gravidade.acel(s, v, m, self.configs['G'])
+        for termo in forcas:  # outras forças, já com os índices dos objetos resolvidos
+            a = a + termo.acel(s, v, m, self.configs['G'])
+        return a.astype(s.dtype, copy=False)  # termos em float64 não mudam a precisão da integração
+
+    def _integrador(self, m):  # retorna a função `passo(s, v, h)` do integrador configurado
+        nome = self.configs['integrador']
+        forcas = [termo._preparar(self) for termo in self.configs['forcas']]
+        if nome == 'euler':
+            def passo(s, v, h):
+                return itg.passo_euler(s, v, h, lambda s_, v_: self._ar(s_, v_, m, forcas))
+        elif nome == 'wh':
+            if forcas:
+                raise ValueError('O integrador de Wisdom–Holman só aceita a gravidade, sem `configs[\'forcas\']`.')
+            central = self._get_index(self.configs['central'])
+            if central is None:  # se não for definido, o corpo central é o mais massivo
+                central = int(np.argmax(m))
+            if m[central] <= 0:
+                raise ValueError('O corpo central do integrador de Wisdom–Holman precisa ter massa positiva.')
+            m_outros = np.delete(m, central)
+            g = self.configs['G']
+
+            def passo(s, v, h):
+                return itg.passo_wh(s, v, h, m, g, central,
+                                    lambda q, u: self._ar(q, u, m_outros))
+        else:
+            raise ValueError(f'Integrador desconhecido: \'{nome}\'. Ver `integradores.integradores`.')
+        return passo
+
+    def _definir_estado(self, s, v):  # atualiza os vetores dos objetos com o estado em arrays
+        for o, s_o, v_o in zip(self.objs, s, v):
+            o.s = s_o
+            o.v = v_o
 
     def iterar(self):
         """
-        Iteração básica de uma simulação usando método de Euler. Atualiza todos os valores dos objetos um a um.
-        O tamanho do passo é o atributo `h` da simulação
+        Iteração básica de uma simulação, usando o integrador definido em `configs['integrador']`. Atualiza todos os
+        valores dos objetos de uma vez. O tamanho do passo é o atributo `h` da simulação
 
         Retorna
         -------
@@ -204,16 +603,13 @@ class Sim:
         if len(self.objs) == 0:
             raise NameError('Não há nenhum objeto nesta simulação.'
                             ' Tente adicionar objetos usando o método `.add_obj()`.')
-        h = self.h
-        s_list = []  # lista com posição dos objetos em cada iteração
-        for o in self.objs:  # calcula os estados para cada objeto
-            # atualiza o valor das variáveis do objeto o:
-            o.s = o.s + h * o.v
-            o.v = o.v + h * self._ar(o)
-            s_list.append(o.s)
-        return np.array(s_list)
+        s, v, m = self.estado()
+        s, v = self._integrador(m)(s, v, self.h)
+        self._definir_estado(s, v)
+        self._t += self.h
+        return s
 
-    def simular(self, t, h=0.01):
+    def simular(self, t, h=0.01, orcamento=None, cancelar=None, progresso=None, eventos=None):
         """
         Executa diversas iterações e retorna um histórico delas. Ao final atualiza as listas `.dados` e `.tempos`.
 
@@ -223,6 +619,24 @@ class Sim:
             Tempo total da simulação em segundos.
         h: float, padrão= 1/30
             Tamanho do passo entre cada iteração em segundos.
+        orcamento : int, float ou None, padrão=None
+            Tempo máximo de execução, em segundos de relógio (não de simulação). None para sem limite.
+        cancelar : threading.Event ou None, padrão=None
+            Sinal de cancelamento: qualquer objeto com o método `is_set()`. Quando ele for marcado (de outra thread,
+            por exemplo), a simulação para no fim do passo atual.
+        progresso : function ou None, padrão=None
+            Função `progresso(feitos, total, eta)` chamada cerca de duas vezes por segundo com o número de passos
+            feitos, o total de passos e a estimativa de tempo restante em segundos. A última chamada tem estimativa 0.0
+            ou, se a simulação parou antes do fim, np.inf.
+        eventos : eventos.Evento, list ou None, padrão=None
+            Eventos a detectar durante a simulação (ver o módulo `eventos`). Cada ocorrência é guardada em
+            `ocorrencias`, com o instante exato e o estado de todos os objetos nele.
+
+        Retorna
+        -------
+        bool
+            True se a simulação foi até o fim, False se foi interrompida pelo orçamento, cancelamento ou por um evento
+            terminal.
 
         Notas
         -----
@@ -234,6 +648,29 @@ class Sim:
         `o`, o índice de cada Objeto na dada iteração;
         e `d` a Direção/coordenada de cada objeto em cada iteração.
 
+        Cada posição em `dados[i]` é a do instante `tempos[i]`, ou seja, a primeira é o estado inicial. Chamar este
+        método de novo continua a simulação de onde parou, adicionando os novos passos ao final de `dados` e `tempos`.
+
+        O integrador usado é o de `configs['integrador']`: 'euler' (padrão), ou 'wh' para o mapa simplético de
+        Wisdom–Holman, indicado para sistemas com um corpo central dominante (como sistemas planetários), em que
+        permite passos bem maiores. O corpo central é `configs['central']` ou, se for None, o mais massivo.
+
+        Se interrompida, a simulação para sempre entre dois passos: `dados` e `tempos` ficam com os passos já feitos
+        e os objetos com o estado do fim do último passo, então ela pode ser continuada depois normalmente.
+
+        Os eventos são testados ao fim de cada passo: se a função de algum mudou de sinal, o instante em que ela zera é
+        encontrado refazendo o passo a partir do seu início com passos menores (método de Illinois), com precisão
+        muito melhor que `h`. Com um evento terminal, a simulação para nesse instante e os objetos ficam com o estado
+        do evento; `dados` e `tempos` ficam só com os passos completos antes dele.
+
+        Com `configs['publicar']` definido, o estado atual e os últimos passos são publicados em memória compartilhada
+        durante a simulação (no máximo uma vez a cada `intervalo` do publicador, e sempre no fim), para outros
+        processos lerem com `compartilhado.Leitor`.
+
+        Com `configs['cache']` definido, uma simulação idêntica a uma já feita (mesmo estado inicial, massas, `G`, `h`,
+        número de passos e integrador) é lida do disco em vez de calculada. Simulações com eventos ou com
+        `configs['gravidade']` e `configs['forcas']` diferentes do padrão não usam o cache.
+
         Raise
         -----
         ValueError
@@ -242,27 +679,428 @@ class Sim:
         Ver também
         ----------
         iterar()
+        integradores
         """
         if len(self.objs) == 0:
             raise ValueError('Nenhum objeto adicionado a simulação atual.')
-        t_hist = np.arange(0, t, h)  # cria uma lista de instantes no intervalo e passo definido
-        if len(self.tempos) == 0:  # se a lista tempos era vazia, sobscreve ela com t_hist
-            self.tempos = t_hist
-        else:  # senão, adiciona t_hist ao final de tempos
-            np.append(self.tempos, t_hist)
+        n = len(np.arange(0, t, h))  # número de passos no intervalo e passo definido
+        print('Calculando {} iterações e {} interações.'.format(n, n * len(self.objs) ** 2))
+        completa = self._avancar(n, h, orcamento, cancelar, progresso, eventos)
+        if not completa:
+            print(f'Simulação interrompida em t={self._t}.')
+        return completa
+
+    async def simular_async(self, t, h=0.01, progresso=None, eventos=None, passos_bloco=1000, executor=None):
+        """
+        Versão assíncrona de `simular()`, para usar dentro de um loop do asyncio sem travá-lo. Os passos são calculados
+        em blocos num executor (por padrão, o do próprio loop) e, entre os blocos, o loop fica livre para outras
+        tarefas, como outras simulações.
+
+        Parâmetros
+        ----------
+        t : int ou float
+            Tempo total da simulação em segundos.
+        h : float, padrão=0.01
+            Tamanho do passo entre cada iteração em segundos.
+        progresso : function, função assíncrona ou None, padrão=None
+            Função `progresso(feitos, total, eta)` chamada no loop ao fim de cada bloco, como em `simular()`. Se ela
+            for assíncrona (retornar um aguardável), é aguardada antes do próximo bloco.
+        eventos : eventos.Evento, list ou None, padrão=None
+            Eventos a detectar durante a simulação, como em `simular()`.
+        passos_bloco : int, padrão=1000
+            Número de passos calculados em cada bloco.
+        executor : concurrent.futures.Executor ou None, padrão=None
+            Executor onde os blocos são calculados. None para o executor padrão do loop.
+
+        Retorna
+        -------
+        bool
+            True se a simulação foi até o fim, False se foi interrompida por um evento terminal.
+
+        Raise
+        -----
+        ValueError
+            Nenhum objeto adicionado a simulação atual.
+        asyncio.CancelledError
+            A tarefa foi cancelada.
+
+        Notas
+        -----
+        Cancelar a tarefa (`tarefa.cancel()`) para a simulação no fim do passo atual do bloco em execução, e o
+        cancelamento só é repassado depois que ele termina. Assim, como em `simular()` com `cancelar`, a simulação
+        fica sempre entre dois passos e pode ser continuada depois normalmente.
+
+        Exemplos
+        --------
+        async def main():
+            await asyncio.gather(*(s.simular_async(100) for s in simulacoes))
+
+        Ver também
+        ----------
+        simular()
+        passos_async()
+        """
+        completa = True
+        async for completa, _ in self._blocos_async(t, h, progresso, eventos, passos_bloco, executor):
+            pass
+        if not completa:
+            print(f'Simulação interrompida em t={self._t}.')
+        return completa
+
+    async def passos_async(self, t, h=0.01, progresso=None, eventos=None, passos_bloco=1000, executor=None):
+        """
+        Iterador assíncrono que simula como `simular_async()` e entrega cada passo guardado assim que o bloco dele é
+        calculado, para acompanhar uma simulação longa (enviando os estados a um cliente, por exemplo).
+
+        Parâmetros
+        ----------
+        t, h, progresso, eventos, passos_bloco, executor
+            Os mesmos de `simular_async()`. Com `configs['capacidade']`, os blocos têm no máximo `capacidade` passos,
+            para que nenhum passo saia do buffer circular antes de ser entregue.
+
+        Retorna
+        -------
+        iterador assíncrono de tuple
+            Tuplas `(tempo, posicoes)` de cada passo guardado, com as posições de formato (N, 2).
+
+        Exemplos
+        --------
+        async for tempo, posicoes in s.passos_async(10):
+            await enviar(tempo, posicoes.tolist())
+
+        Ver também
+        ----------
+        simular_async()
+        """
+        if self.configs['capacidade'] is not None:
+            passos_bloco = min(passos_bloco, self.configs['capacidade'])
+        async for _, t0 in self._blocos_async(t, h, progresso, eventos, passos_bloco, executor):
+            for i in range(self.tempos.buscar(t0 - h / 2), len(self.tempos)):  # passos do bloco
+                yield self.tempos[i], self.dados[i]
+
+    async def _blocos_async(self, t, h, progresso, eventos, passos_bloco, executor):
+        # simula em blocos num executor, entregando ao fim de cada bloco se ele foi completo e o instante inicial dele
+        import asyncio
+        import threading
+
+        if len(self.objs) == 0:
+            raise ValueError('Nenhum objeto adicionado a simulação atual.')
+        n = len(np.arange(0, t, h))  # número de passos no intervalo e passo definido
+        print('Calculando {} iterações e {} interações.'.format(n, n * len(self.objs) ** 2))
+        loop = asyncio.get_running_loop()
+        cancelar = threading.Event()
+        inicio = time.monotonic()
+        feitos = 0
+        while feitos < n:
+            k = min(passos_bloco, n - feitos)
+            t0 = self._t
+            futuro = loop.run_in_executor(executor, self._avancar, k, h, None, cancelar, None, eventos)
+            try:
+                completa = await asyncio.shield(futuro)  # o cancelamento da tarefa não larga o bloco rodando
+            except asyncio.CancelledError:
+                cancelar.set()  # o bloco para no fim do passo atual
+                await asyncio.wait([futuro])
+                raise
+            feitos += k
+            if progresso is not None:
+                decorrido = time.monotonic() - inicio
+                r = progresso(feitos, n, decorrido / feitos * (n - feitos))
+                if hasattr(r, '__await__'):
+                    await r
+            yield completa, t0
+            if not completa:  # evento terminal
+                return
+
+    def _avancar(self, n, h, orcamento=None, cancelar=None, progresso=None, eventos=None):
+        # executa até n passos guardando os dados, retorna se todos foram feitos
+        if self.configs['capacidade'] is not None and self.configs['compressao'] is not None:
+            raise ValueError('`configs[\'capacidade\']` e `configs[\'compressao\']` não podem ser usados juntos.')
         self.h = h  # atualiza o valor de passo utilizado
+        precisao, precisao_dados = self._precisoes()
+        if self.configs['compressao'] is not None:  # comprime o estado da integração, sem arredondar antes
+            precisao_dados = precisao
+        s, v, m = self.estado()
+        if self._t == self._t_inicial:  # guarda o estado inicial para `estado_em`
+            self._definir_inicial(s, v)
+        s, v, m = s.astype(precisao), v.astype(precisao), m.astype(precisao)
+        if isinstance(eventos, evt.Evento):
+            eventos = [eventos]
+
+        cache = self.configs['cache']
+        chave = None
+        # o cache só vale para a gravidade padrão e sem eventos, que teriam efeitos fora da trajetória
+        if cache is not None and not eventos and self.configs['gravidade'] is None and not self.configs['forcas']:
+            chave = cache.chave(s, v, m, G=float(self.configs['G']), h=float(h), n=n,
+                                integrador=self.configs['integrador'],
+                                central=self._get_index(self.configs['central']),
+                                gravar_vel=bool(self.configs['gravar_vel']), precisao=precisao.name,
+                                precisao_dados=precisao_dados.name, capacidade=self.configs['capacidade'])
+        guardado = None if chave is None else cache.ler(chave)
+        if guardado is not None:
+            print('Resultado recuperado do cache.')
+            s_hist, s, v = guardado['s_hist'], guardado['s'], guardado['v']
+            v_hist = guardado.get('v_hist')
+            feitos, t_final = n, None
+            if progresso is not None:
+                progresso(n, n, 0.0)
+        else:
+            s_hist, v_hist, s, v, feitos, t_final = self._integrar(s, v, m, n, h, orcamento, cancelar, progresso,
+                                                                   eventos, precisao_dados)
+            if chave is not None and feitos == n:
+                cache.guardar(chave, s_hist=s_hist, s=s, v=v, **({} if v_hist is None else {'v_hist': v_hist}))
+
+        # instantes de cada passo guardado (com `capacidade`, só os últimos), a partir do instante atual
+        t_hist = self._t + h * np.arange(feitos - len(s_hist), feitos)
+        self._definir_estado(s, v)
+        self._t = self._t + feitos * h if t_final is None else t_final
+        if guardado is not None and self.configs['publicar'] is not None:  # lido do cache, publica só o fim
+            self.configs['publicar'].publicar(self._t, s, v, t_hist, s_hist, h)
+
+        # os passos novos viram um bloco a mais, sem copiar os anteriores (que podem ser compartilhados com forks)
+        novo = len(self.tempos) == 0
+        self.tempos = self._anexar(self.tempos, t_hist)
+        self.dados = self._anexar(self.dados, s_hist, comprimir=True)
+        if v_hist is not None and (novo or len(self.vels) > 0):
+            self.vels = self._anexar(self.vels, v_hist, comprimir=True)
+        else:  # velocidades só servem se cobrirem todos os passos
+            self.vels = []
+        return feitos == n
+
+    def _anexar(self, traj, bloco, comprimir=False):  # adiciona um bloco de passos a `dados`, `vels` ou `tempos`
+        capacidade = self.configs['capacidade']
+        tolerancia = self.configs['compressao'] if comprimir else None
+        if tolerancia is not None:
+            if not isinstance(traj, trj.TrajetoriaComprimida) or traj.tolerancia != tolerancia:
+                traj = trj.TrajetoriaComprimida(tolerancia, [np.asarray(traj)] if len(traj) else [])
+            return traj.anexar(bloco)
+        if capacidade is None:
+            if isinstance(traj, (trj.TrajetoriaCircular, trj.TrajetoriaComprimida)):  # volta a guardar tudo sem perdas
+                traj = trj.Trajetoria([np.asarray(traj)])
+            return trj.Trajetoria([bloco]) if len(traj) == 0 else traj.anexar(bloco)
+        if not isinstance(traj, trj.TrajetoriaCircular) or traj.capacidade != capacidade:
+            traj = trj.TrajetoriaCircular(capacidade, [traj[-capacidade:]] if len(traj) else [])
+        return traj.anexar(bloco)
+
+    def _integrar(self, s, v, m, n, h, orcamento, cancelar, progresso, eventos, precisao_dados):
+        # loop de integração de `_avancar`; retorna os históricos, o estado final, o número de passos feitos e o
+        # instante do evento terminal (ou None)
+        passo = self._integrador(m)
+        eventos = [(e, e._preparar(self)) for e in eventos or ()]  # eventos com as funções g(t, s, v) prontas
+        g_ev = [g(self._t, s, v) for e, g in eventos]  # valor de cada função no início do passo
+        t_final = None  # instante do evento terminal, se houver
+        # com `capacidade`, os históricos são circulares e guardam só os últimos passos
+        tam = n if self.configs['capacidade'] is None else min(n, self.configs['capacidade'])
+        s_hist = np.empty((tam, len(self.objs), 2), precisao_dados)  # posições dos objetos durante toda a simulação
+        v_hist = np.empty((tam, len(self.objs), 2), precisao_dados) if self.configs['gravar_vel'] else None
+
+        inicio = time.monotonic()
+        limite = np.inf if orcamento is None else inicio + orcamento
+        proximo_aviso = inicio + 0.5  # instante do próximo aviso de progresso
+        publicador = self.configs['publicar']
+        proximo_envio = inicio  # instante da próxima publicação em memória compartilhada
+        publicado = 0  # primeiro passo ainda não publicado
+        feitos = n
+        for i in range(n):  # loop de iterações em cada instante
+            agora = time.monotonic()
+            if agora > limite or (cancelar is not None and cancelar.is_set()):
+                feitos = i
+                break
+            if progresso is not None and agora >= proximo_aviso:
+                progresso(i, n, (agora - inicio) / i * (n - i) if i else np.inf)
+                proximo_aviso = agora + 0.5
+            s_hist[i % tam] = s  # guarda as posições do instante atual
+            if v_hist is not None:
+                v_hist[i % tam] = v
+            if publicador is not None and agora >= proximo_envio:
+                self._publicar(publicador, self._t + i * h, s, v, h, s_hist, publicado, i + 1, tam)
+                publicado = i + 1
+                proximo_envio = agora + publicador.intervalo
+            s1, v1 = passo(s, v, h)
+            if eventos:
+                t0 = self._t + i * h
+                g1 = [g(t0 + h, s1, v1) for e, g in eventos]
+                achados = [evt._raiz(g, passo, s, v, t0, h, g_ev[j], g1[j]) + (e,)
+                           for j, (e, g) in enumerate(eventos) if e._cruzou(g_ev[j], g1[j])]
+                achados.sort(key=lambda a: a[0])
+                for te, se, ve, e in achados:
+                    self.ocorrencias.append(evt.Ocorrencia(te, e.nome, se, ve))
+                    if e.terminal:  # para no instante do evento, descartando os que viriam depois
+                        print(f'Evento terminal "{e.nome}" em t={te}.')
+                        s1, v1, t_final = se, ve, te
+                        break
+                g_ev = g1
+            s, v = s1, v1
+            if t_final is not None:
+                feitos = i + 1
+                break
+        if progresso is not None:  # parada antes do fim (cancelamento, orçamento ou evento): sem estimativa
+            progresso(feitos, n, 0.0 if feitos == n else np.inf)
+        if publicador is not None:  # estado final
+            t = self._t + feitos * h if t_final is None else t_final
+            self._publicar(publicador, t, s, v, h, s_hist, publicado, feitos, tam)
+
+        if feitos < tam:  # descarta o espaço dos passos não feitos
+            s_hist = s_hist[:feitos].copy()
+            v_hist = None if v_hist is None else v_hist[:feitos].copy()
+        elif feitos % tam:  # o histórico circular deu a volta, põe o passo mais antigo no início
+            s_hist = np.roll(s_hist, -(feitos % tam), axis=0)
+            v_hist = None if v_hist is None else np.roll(v_hist, -(feitos % tam), axis=0)
+        return s_hist, v_hist, s, v, feitos, t_final
+
+    def _publicar(self, publicador, t, s, v, h, s_hist, ini, fim, tam):
+        # publica o estado atual e os passos ini:fim do histórico (circular, de tamanho tam) ainda guardados nele
+        passos = np.arange(max(ini, fim - min(tam, publicador.capacidade)), fim)
+        publicador.publicar(t, s, v, self._t + h * passos, s_hist[passos % tam], h)
+
+    def estado_em(self, t):
+        """
+        Calcula o estado dos objetos num instante qualquer sem guardar os passos intermediários em `dados`.
+
+        A integração parte do checkpoint guardado mais próximo antes de `t` (ou do estado inicial) e os novos
+        checkpoints criados no caminho ficam guardados para as próximas consultas. Assim, consultas espalhadas no
+        tempo só custam a integração entre checkpoints vizinhos.
+
+        Parâmetros
+        ----------
+        t : int ou float
+            Instante desejado, em segundos, a partir do início da simulação (ou do instante do fork, numa simulação
+            criada por `fork()`).
+
+        Retorna
+        -------
+        tuple de ndarray
+            Posições e velocidades de todos os objetos no instante `t`, ambos de formato (N, 2).
+
+        Raise
+        -----
+        ValueError
+            Nenhum objeto adicionado a simulação atual.
+        ValueError
+            Instante negativo, ou anterior ao fork numa simulação criada por `fork()`.
+        ValueError
+            O estado inicial da simulação não é conhecido.
+
+            Levantado quando os objetos já foram alterados por `iterar()` antes de qualquer consulta ou simulação.
+
+        Notas
+        -----
+        O passo usado é o `h` da simulação, com um último passo menor para chegar exatamente em `t`, então o
+        resultado é o mesmo de `simular()` com o mesmo `h`. Os objetos e os dados da simulação não são alterados.
+
+        Os checkpoints são guardados a cada `configs['intervalo_checkpoints']` passos e os menos usados recentemente
+        são descartados quando ocupam mais que `configs['memoria_checkpoints']` MB. Alterar `h`, `G`, as massas, o
+        integrador ou o estado inicial descarta todos.
+
+        Ver também
+        ----------
+        Sim.simular()
+        Sim.posicoes_em()
+        """
+        if len(self.objs) == 0:
+            raise ValueError('Nenhum objeto adicionado a simulação atual.')
+        t0 = self._t_inicial
+        if t < t0:
+            raise ValueError(f'O instante deve ser a partir de t={t0} (início da simulação, ou instante do fork).')
+        if self._t == t0:  # nada foi simulado: os objetos estão no estado inicial (talvez alterado desde a última vez)
+            self._definir_inicial(*self.estado()[:2])
+        elif self._inicial is None or len(self._inicial[0]) != len(self.objs):
+            raise ValueError('O estado inicial da simulação não é conhecido.')
+
+        h = self.h
+        precisao = self._precisoes()[0]
+        m = np.array([o.m for o in self.objs], dtype=precisao)
+        chave = (h, self.configs['G'], self.configs['integrador'], self._get_index(self.configs['central']),
+                 len(self.objs), id(self.configs['gravidade']), tuple(map(id, self.configs['forcas'])), precisao,
+                 m.tobytes())
+        if self._chave_checkpoints != chave:  # checkpoints de outra configuração não servem
+            self._checkpoints = OrderedDict()
+            self._chave_checkpoints = chave
+
+        k_alvo = int(np.floor((t - t0) / h + 1e-9))  # último passo inteiro antes de t
+        k = max((k for k in self._checkpoints if k <= k_alvo), default=0)
+        s, v = self._inicial if k == 0 else self._checkpoints[k]
+        s, v = s.astype(precisao, copy=False), v.astype(precisao, copy=False)
+        if k:
+            self._checkpoints.move_to_end(k)  # marca como usado recentemente
+
+        passo = self._integrador(m)
+        intervalo = self.configs['intervalo_checkpoints']
+        while k < k_alvo:
+            s, v = passo(s, v, h)
+            k += 1
+            if k % intervalo == 0 or k == k_alvo:
+                self._guardar_checkpoint(k, s, v)
+        dt = t - t0 - k_alvo * h
+        if dt > 1e-12 * h:  # passo final menor, até o instante exato
+            s, v = passo(s, v, dt)
+        return s.copy(), v.copy()
+
+    def _definir_inicial(self, s, v):  # novo estado inicial de `estado_em`; os checkpoints antigos não valem mais
+        if (self._inicial is not None and self._t_inicial == self._t and np.array_equal(self._inicial[0], s)
+                and np.array_equal(self._inicial[1], v)):
+            return
+        self._inicial = (np.array(s), np.array(v))  # cópias: `s` e `v` podem ser visões de arrays do usuário
+        self._t_inicial = self._t
+        self._checkpoints = OrderedDict()
+        self._chave_checkpoints = None
+
+    def _guardar_checkpoint(self, k, s, v):  # guarda um checkpoint e descarta os mais antigos além do limite
+        self._checkpoints[k] = (s, v)
+        self._checkpoints.move_to_end(k)
+        limite = self.configs['memoria_checkpoints'] * 2 ** 20
+        while len(self._checkpoints) > 1 and len(self._checkpoints) * (s.nbytes + v.nbytes) > limite:
+            self._checkpoints.popitem(last=False)  # descarta o menos usado recentemente
+
+    def posicoes_em(self, t):
+        """
+        Retorna as posições dos objetos em instantes quaisquer, interpolando entre os passos guardados em `dados`.
+
+        Parâmetros
+        ----------
+        t : int, float ou array_like
+            Instante ou array de instantes. Instantes fora do intervalo simulado são levados ao extremo mais próximo.
 
-        print('Calculando {} iterações e {} interações.'.format(len(t_hist), len(t_hist) * len(self.objs) ** 2))
-        s_hist = []  # lista com as posições dos objetos durante toda a simulação
-        for _ in t_hist:  # loop de iterações em cada instante
-            s_hist.append(self.iterar())  # adiciona as posições do frame à lista de iterações
+        Retorna
+        -------
+        ndarray
+            Posições de formato (N, 2) para um único instante, ou (len(t), N, 2) para um array de instantes.
 
-        if len(self.dados) == 0:  # se a lista dados era vazia, sobrescreve ela com s_hist
-            self.dados = np.array(s_hist)
-        else:  # senão, adicona s_hist ao final de dados
-            dados = self.dados.tolist()  # transforma em lista para não perder o formato
-            dados.append(s_hist)
-            self.dados = np.array(dados)
+        Raise
+        -----
+        NameError
+            Não há dados de simulação neste objeto. Tente fazer uma simulação usando o método `.simular()`.
+
+        Notas
+        -----
+        Se as velocidades tiverem sido guardadas (`configs['gravar_vel']`), a interpolação é pelo polinômio cúbico de
+        Hermite, que usa posições e velocidades dos dois passos vizinhos e tem erro de ordem h⁴. Senão, é linear.
+        Assim é possível simular com o passo que a física precisa e ainda ter animações suaves, com qualquer fps.
+
+        Ver também
+        ----------
+        Sim.simular()
+        Sim.animar()
+        """
+        if len(self.tempos) == 0:
+            raise NameError('Não há dados de simulação neste objeto.'
+                            ' Tente fazer uma simulação usando o método `.simular()`.')
+        tempos = self.tempos  # sem juntar os blocos, só os passos usados são lidos
+        if len(tempos) == 1:
+            return np.broadcast_to(self.dados[0], np.shape(t) + self.dados[0].shape).copy()
+
+        t = np.clip(np.asarray(t, dtype=float), tempos[0], tempos[-1])
+        i = np.clip(tempos.buscar(t, 'right') - 1, 0, len(tempos) - 2)  # passo anterior a cada t
+        dt = (tempos[i + 1] - tempos[i])[..., None, None]
+        u = (t - tempos[i])[..., None, None] / dt  # fração do passo
+        p0 = self.dados[i]
+        p1 = self.dados[i + 1]
+        if len(self.vels) != len(self.dados):  # sem velocidades, interpolação linear
+            return p0 + u * (p1 - p0)
+
+        u2 = u * u
+        u3 = u2 * u
+        return ((2 * u3 - 3 * u2 + 1) * p0 + (u3 - 2 * u2 + u) * dt * self.vels[i]
+                + (3 * u2 - 2 * u3) * p1 + (u3 - u2) * dt * self.vels[i + 1])
 
     def animar(self, salvar_em=''):
         """
@@ -305,93 +1143,81 @@ class Sim:
         Sim.simular()
         Sim.configs
         """
-        # configurações
-        plt.style.use(self.configs['estilo'])
-        xlim = self.configs['lims'][0]
-        ylim = self.configs['lims'][1]
-        seguir = self.configs['seguir']
-        vel = self.configs['vel']
-        fps = self.configs['fps']
+        _graficos().animar(self, salvar_em)
 
-        if len(self.tempos) == 0:  # se uma simulação não tiver sido feita ele levanta esse erro
-            raise NameError('Não há dados de simulação neste objeto.'
-                            ' Tente fazer uma simulação usando o método `.simular()`.')
-        else:
-            dados = self.dados
-            tempos = self.tempos
+    def exportar(self, salvar_em, progresso=None):
+        """
+        Salva a animação num arquivo em segundo plano, sem bloquear quem chamou e sem exibir nada.
 
-        h = self.h
-        t_max = tempos[-1] + h  # retoma duração da simulação
-        dt = (1 / fps)  # intervalo entre frames
-        print('Compilando vídeo. Duração: {}s, numero de frames: {}'.format(t_max / vel, int(t_max / dt)))
+        Parâmetros
+        ----------
+        salvar_em : string
+            Diretório do arquivo a ser salvo, incluindo o nome do arquivo, num formato suportado.
+        progresso : function ou None, padrão=None
+            Função `progresso(frame, total)` chamada depois de cada frame salvo (a partir da thread de exportação).
 
-        cores = []
-        for o in self.objs:
-            cores.append(o.cor)
-
-        def func_animar(f):  # gerador de função animar. f é o frame atual
-            t = f * dt * vel  # instante atual
-            p = np.argmax(tempos >= t)  # passo atual (primeiro instate após o frame atual)
-            pos = np.array(dados[p])  # posições no passo atual
-
-            plt.cla()  # limpa o plot anterior
-            plt.axis('scaled')
-
-            for func in self._extra_plots:
-                func(p)
-
-            if seguir is None:  # configurações de limite responsivo
-                plt.xlim(xlim)  # limites fixos
-                plt.ylim(ylim)
-            elif seguir in self.objs:  # se seguir é objeto da simulação
-                ind = self.objs.index(seguir)  # pega o índice do objeto na lista `objs`
-                plt.xlim(xlim + pos[ind, 0])  # limite atualizado de acordo com a posição do objeto
-                plt.ylim(ylim + pos[ind, 1])
-            elif isinstance(seguir, int) and seguir < len(self.objs):  # se for um índice de um objeto
-                plt.xlim(xlim + pos[seguir, 0])  # limite atualizado de acordo com a posição do objeto
-                plt.ylim(ylim + pos[seguir, 1])
-
-            plt.scatter(pos[:, 0], pos[:, 1], c=cores)  # plota os pontos
-
-        anim = FuncAnimation(plt.gcf(), func_animar,
-                             frames=int(t_max / dt), interval=1000 / (vel * fps))  # faz o loop de animação
-        if salvar_em != '':
-            formato = salvar_em.split('.')[-1]  # retorna o texto após o último ponto do diretório
-            salvar = True
-            if formato not in formatos_suportados:  # checa se o formato está na lista de suportados
-                r = input(f'Este formato de vídeo, \'.{formato}\' pode não ser suportado.'
-                          f' Tentar mesmo assim? [S/N]\n->')
-                if r != 'S':
-                    print('Ok, então o vídeo não será salvo.')
-                    salvar = False
+        Retorna
+        -------
+        concurrent.futures.Future
+            Controle da exportação. `.result()` espera terminar e retorna `salvar_em` (ou levanta o erro que houver),
+            e `.done()` diz se já terminou.
 
-            try:
-                if salvar:  # não tenta salvar a animação se o usuário esitir, acima
-                    writer = writers['ffmpeg']
-                    escritor = writer(fps=fps)
-                    anim.save(salvar_em, escritor)  # salva a animação usando ffmpeg
-                    print(f'Vídeo salvo em {salvar_em}')
-            except UnicodeDecodeError:
-                raise UserWarning('Este formato de vídeo não é suportado.'
-                                  '\nTente acessar simul.formatos_suportados para ver uma série de opções.'
-                                  '\nSugerido: .mp4')
-                # isto serve apenas para substuir o erro do matplolib que é ilegível
-
-        print('Exibindo...')
-        plt.show()
-        plt.close()
+        Raise
+        -----
+        NameError
+            Não há dados de simulação neste objeto. Tente fazer uma simulação usando o método `.simular()`.
+        ValueError
+            Este formato de vídeo não é suportado.
+
+            Ver variável `formatos_suportados`.
+
+        Notas
+        -----
+        A exportação trabalha sobre uma cópia rasa da simulação feita na chamada, então se pode continuar simulando,
+        alterar `configs` ou exportar outras animações ao mesmo tempo. Cada exportação desenha numa figura própria,
+        sem usar o pyplot. O estilo da matplotlib, que é global, é resolvido uma vez e aplicado sob uma trava só
+        enquanto os elementos de cada frame são criados; o desenho e a codificação dos frames são feitos sem ela.
+
+        .. warning:: Assim como em `.animar()`, se faz necessário ter instalado ffmpeg.
+
+        Ver também
+        ----------
+        Sim.animar()
+        """
+        if len(self.tempos) == 0:
+            raise NameError('Não há dados de simulação neste objeto.'
+                            ' Tente fazer uma simulação usando o método `.simular()`.')
+        formato = salvar_em.split('.')[-1]
+        if formato not in formatos_suportados:
+            raise ValueError(f'Este formato de vídeo, \'.{formato}\' não é suportado.')
+        graficos = _graficos()
+        return graficos._executor().submit(graficos._exportar, self._instantaneo(), salvar_em, progresso)
+
+    def _instantaneo(self):  # cópia rasa da simulação, que não muda se esta continuar sendo simulada ou configurada
+        copia = copy.copy(self)
+        copia.objs = list(self.objs)
+        copia.configs = dict(self.configs)
+        copia._extra_plots = list(self._extra_plots)
+        for k in ('dados', 'vels', 'tempos'):  # trajetórias circulares são alteradas no lugar, como em `fork()`
+            traj = getattr(self, k)
+            if isinstance(traj, trj.TrajetoriaCircular):
+                setattr(copia, k, trj.TrajetoriaCircular(traj.capacidade, [traj]))
+        return copia
 
     def reset(self):  # reseta a simulação, apagando dados e objetos
         """Método para limpar dados da simulação e reiniciar configs"""
         self.dados = []
+        self.vels = []
         self.tempos = []
         self.objs = []
-        self.configs = {'estilo': 'dark_background',  # estilo de fundo
-                        'seguir': -1,  # objeto seguido (negativo para nenhum)
-                        'xlim': (-5, 5), 'ylim': (-5, 5),
-                        'fps': 30, 'vel': 1,  # limites de enquadramento
-                        'G': 1}  # Constante da gravitação universal; real = 6.6708e-11; 0 para sem gravidade
+        self.configs = _configs_padrao()
         self.h = 0.01
+        self._t = 0.0
+        self._inicial = None
+        self._t_inicial = 0.0
+        self._checkpoints = OrderedDict()
+        self._chave_checkpoints = None
+        self.ocorrencias = []
 
     def _get_index(self, o):  # função interna que retorna um ínidice de objeto mesmo independente da input
         # assim, serve como tratamento de input para funções aplicadas sobre objetos na simulação
@@ -441,7 +1267,7 @@ class Sim:
 
         return t0, t1, t_max
 
-    def rastro(self, obj, inicio=0, parar=None, fechar=None, cor='tab:gray', ref=None):
+    def rastro(self, obj, inicio=0, parar=None, fechar=None, cor='tab:gray', ref=None, tolerancia=0.5):
         """
         Método que cria objeto gráfico de rastro. Como um percurso feito pela partícula, que altera ao longo do tempo.
 
@@ -464,6 +1290,9 @@ class Sim:
             Cor do rastro. Padrão de cores da matplotlib. Ver `coisas.Particula`.
         ref : objeto de classe simulável, int ou str, padrão=None
             Objeto, índice ou nome do objeto que servirá de referencial para as posições do rastro.
+        tolerancia : int, float ou None, padrão=0.5
+            Distância máxima, em pixels, entre o rastro desenhado e o percurso simulado. None para desenhar todos os
+            pontos simulados.
 
         Raise
         -----
@@ -496,8 +1325,14 @@ class Sim:
         de forma similar, os tratmentos para `inicio`, `parar` e `fechar` são sempre os mesmos que o descrito (quando
         o método não usa `parar` isto é simplesmente ignorado.
 
+        Rastros longos têm muito mais pontos do que pixels na tela. Por isso, o percurso é simplificado uma única vez
+        pelo algoritmo de Douglas–Peucker com a `tolerancia` dada, e a cada frame se desenha apenas os pontos
+        mantidos até o passo atual, mais o último passo e a ponta do rastro. Assim o custo de desenhar o rastro depende
+        da resolução da tela e não da duração da simulação. O erro fica em até cerca de duas vezes a tolerância.
+
         Este e os ourtos métodos que criam objetos gráficos adicionam uma função a uma lista de funções de plot extras,
-        executada cada frame em `.animar()`.
+        executada cada frame em `.animar()` com a simulação, os eixos onde desenhar, o instante do frame, o último
+        passo simulado antes dele e as posições dos objetos nesse instante (interpoladas, se `configs['interpolar']`).
 
         Ver também
         ----------
@@ -505,44 +1340,68 @@ class Sim:
         .animar()
         coisas.Particula
         """
-        # método que cria função de plotagem de rastro
-        ind = self._get_index(obj)  # objeto a deixar rastro
-        ref = self._get_index(ref)  # objeto de referencial para o rastro
-        t0, t1, t_max = self._extra_plot_time_params(inicio, parar, fechar)
-        # funções de tratamento de inputs
-
-        def _plotar_rastro(p):  # função que plota o gráfico do rastro do momento inicial t0 até o atual t
-            t = self.tempos[p]  # vê o segundo da iteração atual
-            if t0 < t < t_max and p > 0:  # se o intervalo já tiver passado do t_max, não o plota
-                # em i == 0 pode surgir um erro de lista vazia
-                tempos = np.array(self.tempos)
-                dados = np.array(self.dados)  # transforma os dados em array para melhor manipulação
-                p0 = np.argmax(tempos >= t0)  # primeiro passo a exibir o plot
-                p1 = np.argmax(tempos >= t1)  # ultimo passo a ser animado
-                ref_pos_atual = np.zeros(2)
-                if ref is not None:
-                    ref_pos_atual = dados[p, ref]  # posiçao atual do referencial
-
-                if t > t1:  # se o tempo da animação parou  o rastro apra de ser atualizado
-                    p = p1
-
-                abs_pos = dados[p0:p, ind]  # posições do objeto até o momento atual
-                if ref is not None:
-                    ref_pos = dados[p0:p, ref]  # se o referencial não é nulo, retorna as posições do referencial até
-                    # o frame atual
-                else:
-                    ref_pos = np.zeros(2)  # se o referencial é nulo, não retorna nada
+        _graficos().rastro(self, obj, inicio, parar, fechar, cor, ref, tolerancia)
 
-                dists = abs_pos - ref_pos + ref_pos_atual  # calcula as posições em relação a ref e põe junto
-                # a posição atual de ref
+    def rastros(self, objs=None, inicio=0, parar=None, fechar=None, cor='tab:gray', ref=None, duracao=None,
+                desvanecer=False, max_pontos=1000):
+        """
+        Método que cria os rastros de vários objetos (ou de todos) de uma vez, desenhados todos juntos numa única
+        `LineCollection` da matplotlib a cada frame.
 
-                x = dists[:, 0]  # separa os valores x e y de dists
-                y = dists[:, 1]
+        Para mais detalhes dos parâmetros, ver `.rastro()`.
 
-                linha = plt.Line2D(x, y, c=cor)  # retorna uma linha com o rastro do objeto
-                plt.gca().add_line(linha)  # plota a linha
+        Parâmetros
+        ----------
+        objs : lista de objetos de classe simulável, int ou str, ou None, padrão=None
+            Objetos, índices ou nomes dos objetos que irão deixar rastro. None para todos.
+        inicio : int ou float, padrão=0
+            Instante em que a animação deste objeto gráfico começa.
+        parar : int, float ou None, padrão=None
+            Instante em que a animação deste objeto gráfico pausa, ou seja, 'congela'.
+        fechar : int, float ou None, padrão=None
+            Instante em que este objeto gráfico para de ser exibido.
+        cor : string, lista de strings ou None, padrão='tab:gray'
+            Cor de todos os rastros, uma cor para cada objeto, ou None para usar a cor de cada objeto.
+        ref : objeto de classe simulável, int ou str, padrão=None
+            Objeto, índice ou nome do objeto que servirá de referencial para as posições dos rastros.
+        duracao : int, float ou None, padrão=None
+            Duração, em segundos, do trecho mais recente exibido em cada rastro. None para o rastro inteiro.
+        desvanecer : bool, padrão=False
+            Se True, os rastros ficam mais transparentes quanto mais antigo o trecho (em 16 faixas de opacidade).
+        max_pontos : int, padrão=1000
+            Número máximo de pontos de cada rastro. Rastros mais longos são desenhados com um passo a cada tantos.
 
-        self._extra_plots.append(_plotar_rastro)  # retorna a função de plotagem
+        Raise
+        -----
+        ValueError
+            Nome de objeto não corresponde a nenhum da simulação
+
+            Levantado quando se passa uma string inválida como objeto.
+        ValueError
+            Objeto selecionado não foi adicionado à simulação
+
+            Levantado quando se passa um objeto que não foi adicionado à simulação.
+        NameError
+            É necessário executar a simulação antes de adicionar objetos extras de plot.
+            Tente fazer uma simulação usando o método `.simular()`.
+
+            Levantado quando se chama este método antes de `.simular()`.
+        ValueError
+            Tempos de plotagem do objeto extra fora do intervalo da simulação.
+
+            Levantado quando se entra com `parar` ou `fechar` maiores que o tamanho da simulação.
+
+        Notas
+        -----
+        Ao contrário de chamar `.rastro()` para cada objeto, as posições de todos os rastros saem de uma única fatia de
+        `dados` por frame e viram um único objeto gráfico, então desenhar N rastros custa quase o mesmo que desenhar um.
+
+        Ver também
+        ----------
+        .rastro()
+            Com todos os detalhes dos funcionamentos de métodos de animação de objetos gráficos.
+        """
+        _graficos().rastros(self, objs, inicio, parar, fechar, cor, ref, duracao, desvanecer, max_pontos)
 
     def area_kepler(self, foco, satelite, inicio=0, parar=None, fechar=None,
                     cor='tab:cyan', opacidade=0.25, cor_borda='tab:blue'):
@@ -602,35 +1461,7 @@ class Sim:
         .rastro()
             Com todos os detalhes dos funcionamentos de métodos de animação de objetos gráficos.
         """
-        centro = self._get_index(foco)
-        sat = self._get_index(satelite)
-        t0, t1, t_max = self._extra_plot_time_params(inicio, parar, fechar)
-
-        # funções para tratar input
-
-        def _plotar_area(p):
-            t = self.tempos[p]  # vê o segundo da iteração atual
-            if t0 < t < t_max and p > 0:  # se o intervalo já tiver passado, não plota o gráfico
-                tempos = np.array(self.tempos)
-                dados = np.array(self.dados)  # transforma os dados em array para melhor manipulação
-                p0 = np.argmax(tempos >= t0)  # primeiro passo a ser exibido
-                p1 = np.argmax(tempos >= t1)  # ultimo passo a ser animado
-                centro_pos_atual = dados[p, centro]  # posição atual do centro (para referencial)
-
-                if t > t1:  # se o tempo da animação parou para de atualizar o passo para o polígono
-                    p = p1
-                sat_pos = dados[p0:p, sat]
-                centro_pos = dados[p0:p, centro]  # posições do satélite e centro até o momento atual
-
-                sat_dists = sat_pos - centro_pos + centro_pos_atual  # calcula o rastro do satélite
-
-                pos = sat_dists.tolist()
-                pos.append(centro_pos_atual)  # adiciona o centro ao rastro fechando o polígono
-
-                poligono = plt.Polygon(pos, facecolor=cor, alpha=opacidade, edgecolor=cor_borda)  # cria o polígono
-                plt.gca().add_patch(poligono)  # plota o polígono
-
-        self._extra_plots.append(_plotar_area)  # retornaa função de plotagem
+        _graficos().area_kepler(self, foco, satelite, inicio, parar, fechar, cor, opacidade, cor_borda)
 
     def texto(self, texto, local=(0, 0), inicio=0, fechar=None, obj=None,
               cor='w', fonte='serif'):
@@ -683,25 +1514,7 @@ class Sim:
         .rastro()
             Com todos os detalhes dos funcionamentos de métodos de animação de objetos gráficos.
         """
-        ref_ind = self._get_index(obj)
-        rel_pos = np.array(local)  # posição relativa (se tiver objeto como referencial)
-        t0, _, t_max = self._extra_plot_time_params(inicio, None, fechar)
-        # funções para tratar input
-
-        def _plotar_texto(p):
-            t = self.tempos[p]  # vê o segundo da iteração atual
-            if t0 < t < t_max and p > 0:  # se o intervalo já tiver passado, não plota o gráfico
-                dados = np.array(self.dados)  # transforma em array para facilitar manipulação
-                np.argmax(self.tempos >= t0)  # primeiro passo a exibir o plot
-                if ref_ind is None:
-                    ref = np.zeros(2)  # se não tiver um objeto, não faz anda
-                else:
-                    ref = dados[p, ref_ind]  # posição atual do objeto
-
-                p = rel_pos + ref  # calcula a posição do texto em relação ao objeto
-                plt.text(p[0], p[1], texto, color=cor, fontfamily=fonte)  # plota o texto
-
-        self._extra_plots.append(_plotar_texto)  # retorna a função de plotagem
+        _graficos().texto(self, texto, local, inicio, fechar, obj, cor, fonte)
 
     def seta(self, pos_a=(0, 0), pos_b=(0, 0), ref_a=None, ref_b=None, inicio=0, fechar=None,
              largura=0.1, cor='tab:cyan', opacidade=1, cor_borda='tab:blue'):
@@ -761,30 +1574,4 @@ class Sim:
         .rastro()
             Com todos os detalhes dos funcionamentos de métodos de animação de objetos gráficos.
         """
-        pos_a = np.array(pos_a)
-        pos_b = np.array(pos_b)
-        oa_ind = self._get_index(ref_a)
-        ob_ind = self._get_index(ref_b)
-        t0, _, t_max = self._extra_plot_time_params(inicio, None, fechar)
-
-        def _plotar_seta(p):
-            t = self.tempos[p]  # vê o segundo da iteração atual
-            if t0 < t < t_max and p > 0:  # se o intervalo já tiver passado, não plota o gráfico
-                dados = np.array(self.dados)  # transforma os dados em array para melhor manipulação
-                if ref_a is None:  # se ref0 é None, o referencial é 0
-                    obj_a = np.zeros(2)
-                else:  # senão, o referencial é a posição atual
-                    obj_a = np.array(dados[p, oa_ind])
-                if ref_b is None:  # idem do sobrescrito
-                    obj_b = np.zeros(2)
-                else:  # bis in idem
-                    obj_b = np.array(dados[p, ob_ind])
-
-                p = pos_a + obj_a  # calcula a posição de partida do vetor somado ao referencial
-                delta_p = pos_b + obj_b - p  # o vetor em se partindo de p com referencial a outro objeto
-
-                plt.arrow(p[0], p[1], delta_p[0], delta_p[1],
-                          facecolor=cor, alpha=opacidade, edgecolor=cor_borda, width=largura)
-                # plota o a seta
-
-        self._extra_plots.append(_plotar_seta)  # retorna a função de plotagem
+        _graficos().seta(self, pos_a, pos_b, ref_a, ref_b, inicio, fechar, largura, cor, opacidade, cor_borda)
@@ -0,0 +1,559 @@
+"""
+Módulo com o armazenamento das trajetórias simuladas (`Sim.dados`, `Sim.vels` e `Sim.tempos`).
+
+Classes
+-------
+Trajetoria
+    Sequência de estados guardada em blocos imutáveis, que podem ser compartilhados entre simulações.
+TrajetoriaCircular
+    Sequência dos últimos estados guardada num buffer circular de tamanho fixo.
+TrajetoriaComprimida
+    Sequência de estados comprimida com erro máximo conhecido.
+"""
+
+import numpy as np
+
+
+def _varios_avancados(traj, i):  # traj[i] com mais de um índice avançado, ou None se `i` não for desse tipo
+    # o numpy combina índices avançados (arrays e inteiros) entre si, então não dá para aplicar o primeiro separado
+    if not (isinstance(i, tuple) and len(i) > 1 and not isinstance(i[0], slice) and np.ndim(i[0]) > 0
+            and any(not isinstance(r, slice) for r in i[1:])):
+        return None
+    k = np.asarray(i[0])
+    if k.dtype == bool:
+        k = np.flatnonzero(k)
+    n = len(traj)
+    if np.any((k < -n) | (k >= n)):
+        raise IndexError(f'índices fora dos limites da trajetória de tamanho {n}')
+    passos, posicoes = np.unique(k % n if n else k, return_inverse=True)
+    return traj[passos][(posicoes.reshape(k.shape),) + i[1:]]  # só os passos usados, com o índice completo
+
+
+class Trajetoria:
+    """
+    Sequência de estados (posições, velocidades ou instantes de cada passo) guardada como uma lista de blocos de
+    arrays somente leitura. Se comporta como um array do numpy no primeiro eixo: aceita `len()`, índices inteiros,
+    fatias, arrays de índices e tuplas (como `traj[p0:p1, obj]`), e `np.asarray(traj)` retorna o array completo.
+
+    Atributos
+    ---------
+    shape : tuple
+        Formato equivalente do array completo.
+    dtype : numpy.dtype
+        Tipo dos dados.
+
+    Métodos
+    -------
+    anexar(bloco)
+        Retorna uma nova trajetória com `bloco` adicionado ao final.
+    buscar(valores, lado='left')
+        Como `np.searchsorted`, para trajetórias ordenadas de uma dimensão (como `Sim.tempos`).
+
+    Notas
+    -----
+    Os blocos nunca são alterados depois de criados e `anexar` não altera a trajetória original, então várias
+    trajetórias (de simulações diferentes, por exemplo de `Sim.fork()`) podem compartilhar o mesmo começo sem copiá-lo
+    na memória. Índices que caem dentro de um único bloco retornam vistas (somente leitura) dele, sem cópia.
+    """
+    def __init__(self, blocos=()):
+        """
+        Parâmetros
+        ----------
+        blocos : iterable de array_like, padrão=()
+            Blocos iniciais, todos com o mesmo formato depois do primeiro eixo.
+        """
+        self._blocos = []
+        for b in blocos:
+            b = np.asarray(b)
+            if len(b):
+                if b.flags.writeable:  # garante que o bloco não muda depois de compartilhado
+                    b = b.view()
+                    b.flags.writeable = False
+                self._blocos.append(b)
+        self._fins = np.cumsum([len(b) for b in self._blocos], dtype=int)  # índice final de cada bloco
+
+    def anexar(self, bloco):
+        """
+        Retorna uma nova trajetória com os estados de `bloco` adicionados ao final, compartilhando os blocos atuais.
+
+        Parâmetros
+        ----------
+        bloco : array_like
+            Estados a adicionar.
+
+        Retorna
+        -------
+        Trajetoria
+        """
+        return Trajetoria(self._blocos + [bloco])
+
+    def buscar(self, valores, lado='left'):
+        """
+        Índices onde `valores` entrariam mantendo a ordem, como `np.searchsorted`, sem juntar os blocos.
+
+        Parâmetros
+        ----------
+        valores : float ou array_like
+            Valores procurados.
+        lado : {'left', 'right'}, padrão='left'
+            Como o `side` de `np.searchsorted`.
+
+        Retorna
+        -------
+        int ou ndarray de int
+        """
+        valores = np.asarray(valores)
+        ultimos = np.array([b[-1] for b in self._blocos])
+        j = np.searchsorted(ultimos, valores, lado)  # bloco onde está a resposta de cada valor
+        r = np.full(valores.shape, len(self))
+        for b in np.unique(j[j < len(self._blocos)]):
+            sel = j == b
+            r[sel] = self._fins[b] - len(self._blocos[b]) + np.searchsorted(self._blocos[b], valores[sel], lado)
+        return r if r.ndim else int(r)
+
+    def __len__(self):
+        return int(self._fins[-1]) if len(self._fins) else 0
+
+    @property
+    def shape(self):
+        return (len(self),) + (self._blocos[0].shape[1:] if self._blocos else ())
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def dtype(self):
+        return self._blocos[0].dtype if self._blocos else np.dtype(float)
+
+    def __array__(self, dtype=None, copy=None):
+        if len(self._blocos) == 1 and not copy:
+            a = self._blocos[0]
+        elif self._blocos:
+            a = np.concatenate(self._blocos)
+        else:
+            a = np.empty(self.shape)
+        return a if dtype is None else a.astype(dtype, copy=False)
+
+    def __iter__(self):
+        for b in self._blocos:
+            yield from b
+
+    def __getitem__(self, i):
+        r = _varios_avancados(self, i)
+        if r is not None:
+            return r
+        if isinstance(i, tuple):  # indexa o primeiro eixo aqui e o resto no resultado
+            if not i:
+                return self[:]
+            resto = i[1:]
+            if isinstance(i[0], slice) and len(self._blocos) > 1:  # aplica o resto em cada bloco antes de juntar
+                return self._fatia(i[0], (slice(None),) + resto)
+            r = self[i[0]]
+            if np.ndim(i[0]) == 0 and not isinstance(i[0], slice):  # índice inteiro remove o primeiro eixo
+                return r[resto]
+            return r[(slice(None),) + resto]
+
+        n = len(self)
+        if isinstance(i, slice):
+            ini, fim, passo = i.indices(n)
+            if passo > 0:
+                b = np.searchsorted(self._fins, ini, side='right')
+                if b < len(self._blocos) and fim <= self._fins[b]:  # fatia dentro de um bloco, vista sem cópia
+                    d = self._fins[b] - len(self._blocos[b])
+                    return self._blocos[b][ini - d:fim - d:passo]
+            i = np.arange(ini, fim, passo)
+
+        i = np.asarray(i)
+        if i.dtype == bool:
+            i = np.flatnonzero(i)
+        if i.ndim == 0:  # índice inteiro
+            k = int(i)
+            if not -n <= k < n:
+                raise IndexError(f'índice {k} fora dos limites da trajetória de tamanho {n}')
+            k %= n
+            b = np.searchsorted(self._fins, k, side='right')
+            return self._blocos[b][k - self._fins[b] + len(self._blocos[b])]
+
+        k = i.ravel() % n if n else i.ravel()
+        if np.any((i.ravel() < -n) | (i.ravel() >= n)):
+            raise IndexError(f'índices fora dos limites da trajetória de tamanho {n}')
+        b = np.searchsorted(self._fins, k, side='right')  # bloco de cada índice
+        r = np.empty((len(k),) + self.shape[1:], dtype=self.dtype)
+        for j in np.unique(b):
+            sel = b == j
+            r[sel] = self._blocos[j][k[sel] - self._fins[j] + len(self._blocos[j])]
+        return r.reshape(i.shape + self.shape[1:])
+
+    def _fatia(self, fatia, resto):  # self[fatia][resto], sem juntar os blocos inteiros antes de aplicar `resto`
+        ini, fim, passo = fatia.indices(len(self))
+        if passo < 0:
+            return self[np.arange(ini, fim, passo)][resto]
+        partes = []
+        comeco = 0  # índice do primeiro elemento de cada bloco
+        for b in self._blocos:
+            a = max(ini, comeco)
+            a += (ini - a) % passo  # primeiro índice da fatia dentro do bloco
+            z = min(fim, comeco + len(b))
+            if a < z:
+                partes.append(b[a - comeco:z - comeco:passo][resto])
+            comeco += len(b)
+        if not partes:
+            return self._blocos[0][0:0][resto] if self._blocos else np.empty((0,))
+        return np.concatenate(partes)
+
+    def __repr__(self):
+        return f'Trajetoria(shape={self.shape}, blocos={len(self._blocos)})'
+
+
+class TrajetoriaCircular:
+    """
+    Sequência dos últimos `capacidade` estados, guardada num buffer circular de tamanho fixo: quando ele enche, cada
+    estado novo sobrescreve o mais antigo. Tem a mesma interface de `Trajetoria`, com índices lógicos (o índice 0 é
+    sempre o estado mais antigo ainda guardado), então quem a usa não precisa saber onde o buffer dá a volta.
+
+    Atributos
+    ---------
+    capacidade : int
+        Número máximo de estados guardados.
+    shape : tuple
+        Formato equivalente do array completo.
+    dtype : numpy.dtype
+        Tipo dos dados.
+
+    Métodos
+    -------
+    anexar(bloco)
+        Adiciona `bloco` ao final, descartando os estados mais antigos que não cabem, e retorna a própria trajetória.
+    buscar(valores, lado='left')
+        Como `np.searchsorted`, para trajetórias ordenadas de uma dimensão.
+
+    Notas
+    -----
+    Diferente de `Trajetoria`, o buffer é alterado no lugar por `anexar`, então a memória fica constante por mais
+    longa que seja a simulação. Por isso toda indexação retorna cópias, e não vistas do buffer.
+    """
+    def __init__(self, capacidade, blocos=()):
+        """
+        Parâmetros
+        ----------
+        capacidade : int
+            Número máximo de estados guardados.
+        blocos : iterable de array_like, padrão=()
+            Blocos iniciais, todos com o mesmo formato depois do primeiro eixo.
+
+        Raise
+        -----
+        ValueError
+            Capacidade menor que 1.
+        """
+        if capacidade < 1:
+            raise ValueError('A capacidade da trajetória circular deve ser de pelo menos um estado.')
+        self.capacidade = int(capacidade)
+        self._buf = None  # criado no primeiro bloco, quando o formato dos estados é conhecido
+        self._ini = 0  # posição no buffer do estado mais antigo
+        self._n = 0  # número de estados guardados
+        for b in blocos:
+            self.anexar(b)
+
+    def anexar(self, bloco):
+        """
+        Adiciona os estados de `bloco` ao final, sobrescrevendo os mais antigos se não couberem.
+
+        Parâmetros
+        ----------
+        bloco : array_like
+            Estados a adicionar.
+
+        Retorna
+        -------
+        TrajetoriaCircular
+            A própria trajetória.
+        """
+        bloco = np.asarray(bloco)
+        if not len(bloco):
+            return self
+        cap = self.capacidade
+        if self._buf is None:
+            self._buf = np.empty((cap,) + bloco.shape[1:], dtype=bloco.dtype)
+        bloco = bloco[-cap:]  # só os últimos estados cabem
+        k = len(bloco)
+        fim = (self._ini + self._n) % cap  # posição do próximo estado
+        parte = min(k, cap - fim)  # o que cabe antes de dar a volta
+        self._buf[fim:fim + parte] = bloco[:parte]
+        self._buf[:k - parte] = bloco[parte:]
+        excesso = max(self._n + k - cap, 0)  # estados antigos sobrescritos
+        self._ini = (self._ini + excesso) % cap
+        self._n = min(self._n + k, cap)
+        return self
+
+    def __len__(self):
+        return self._n
+
+    def buscar(self, valores, lado='left'):
+        """Índices onde `valores` entrariam mantendo a ordem, como `np.searchsorted`. Ver `Trajetoria.buscar`."""
+        return np.searchsorted(np.asarray(self), valores, lado)
+
+    @property
+    def shape(self):
+        return (self._n,) + (self._buf.shape[1:] if self._buf is not None else ())
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def dtype(self):
+        return self._buf.dtype if self._buf is not None else np.dtype(float)
+
+    def _fisicos(self, k):  # posições no buffer dos índices lógicos k (já entre 0 e len - 1)
+        return (self._ini + k) % self.capacidade
+
+    def __array__(self, dtype=None, copy=None):
+        a = self._buf[self._fisicos(np.arange(self._n))] if self._buf is not None else np.empty(self.shape)
+        return a if dtype is None else a.astype(dtype, copy=False)
+
+    def __iter__(self):
+        for k in range(self._n):
+            yield self._buf[self._fisicos(k)].copy()
+
+    def __getitem__(self, i):
+        r = _varios_avancados(self, i)
+        if r is not None:
+            return r
+        if isinstance(i, tuple):  # indexa o primeiro eixo pelos índices lógicos e o resto normalmente
+            primeiro, resto = (i[0], i[1:]) if i else (slice(None), ())
+        else:
+            primeiro, resto = i, ()
+        n = self._n
+        if isinstance(primeiro, slice):
+            k = np.arange(*primeiro.indices(n))
+        else:
+            k = np.asarray(primeiro)
+            if k.dtype == bool:
+                k = np.flatnonzero(k)
+            if np.any((k < -n) | (k >= n)):
+                raise IndexError(f'índices fora dos limites da trajetória de tamanho {n}')
+            k = k % n if n else k
+        if self._buf is None:
+            return np.empty(k.shape + self.shape[1:])[(slice(None),) * k.ndim + resto]
+        if k.ndim == 0:  # índice inteiro remove o primeiro eixo
+            return self._buf[(int(self._fisicos(k)),) + resto].copy()
+        if all(isinstance(r, slice) or np.ndim(r) == 0 for r in resto):  # um só índice avançado, de uma vez
+            return self._buf[(self._fisicos(k),) + resto]
+        return self._buf[self._fisicos(k)][(slice(None),) * k.ndim + resto]
+
+    def __repr__(self):
+        return f'TrajetoriaCircular(shape={self.shape}, capacidade={self.capacidade})'
+
+
+class TrajetoriaComprimida:
+    """
+    Sequência de estados guardada comprimida com perdas controladas: os valores são arredondados para múltiplos de
+    `2 * tolerancia` (erro máximo `tolerancia` em cada componente) e cada bloco de passos guarda só as diferenças
+    segundas dos valores arredondados (o erro da previsão linear a partir dos dois passos anteriores), que em
+    trajetórias suaves são inteiros pequenos, guardados no menor tipo inteiro que os comporta. Tem a mesma interface
+    de `Trajetoria`.
+
+    Atributos
+    ---------
+    tolerancia : float
+        Erro máximo de cada componente guardada.
+    passos_bloco : int
+        Número de passos de cada bloco comprimido.
+    shape : tuple
+        Formato equivalente do array completo.
+    dtype : numpy.dtype
+        Tipo dos dados descomprimidos, sempre float64.
+    nbytes : int
+        Memória ocupada pelos blocos comprimidos.
+
+    Métodos
+    -------
+    anexar(bloco)
+        Retorna uma nova trajetória com `bloco` adicionado ao final.
+    buscar(valores, lado='left')
+        Como `np.searchsorted`, para trajetórias ordenadas de uma dimensão.
+
+    Notas
+    -----
+    A previsão é feita sobre os valores já arredondados, então a descompressão é exata (em inteiros) e o erro não se
+    acumula ao longo dos passos: ele é sempre no máximo `tolerancia`. Descomprimir um bloco são duas somas acumuladas,
+    e índices como `traj[p0:p1, obj]` só descomprimem as colunas pedidas. O último bloco descomprimido inteiro fica
+    guardado, o que acelera leituras passo a passo (como numa animação).
+
+    Os valores são arredondados e descomprimidos em float64, então o erro máximo vale em relação aos valores recebidos
+    mesmo que eles sejam float32. Como as diferenças são guardadas em inteiros de pelo menos 8 bits, a compressão
+    chega no máximo a cerca de 8 vezes em relação a dados em float64 (4 vezes em relação a float32), por maior que
+    seja a tolerância ou mais suave a trajetória.
+
+    Como em `Trajetoria`, os blocos nunca são alterados e `anexar` retorna uma nova trajetória, então ela pode ser
+    compartilhada entre simulações (por exemplo de `Sim.fork()`).
+    """
+    def __init__(self, tolerancia, blocos=(), passos_bloco=1024):
+        """
+        Parâmetros
+        ----------
+        tolerancia : float
+            Erro máximo de cada componente guardada.
+        blocos : iterable de array_like, padrão=()
+            Blocos iniciais, todos com o mesmo formato depois do primeiro eixo.
+        passos_bloco : int, padrão=1024
+            Número de passos de cada bloco comprimido.
+
+        Raise
+        -----
+        ValueError
+            Tolerância não positiva.
+        """
+        if not tolerancia > 0:
+            raise ValueError('A tolerância da trajetória comprimida deve ser positiva.')
+        self.tolerancia = tolerancia
+        self.passos_bloco = int(passos_bloco)
+        self._blocos = []  # pares (dois primeiros valores em int64, diferenças segundas no menor tipo inteiro)
+        self._formato = None  # formato de cada estado
+        self._cache = (None, None)  # último bloco descomprimido inteiro
+        for b in blocos:
+            self._adicionar(np.asarray(b))
+        self._fins = np.cumsum([len(i) + len(r) for i, r in self._blocos], dtype=int)
+
+    def _comprimir(self, q):  # bloco de valores arredondados (inteiros) para o par (início, diferenças segundas)
+        d2 = np.diff(q, 2, axis=0, prepend=np.zeros((2,) + q.shape[1:], np.int64))
+        # as duas primeiras diferenças envolvem os zeros acrescentados e podem ser grandes
+        inicio, resto = d2[:2], d2[2:]
+        maior = np.abs(resto).max() if len(resto) else 0
+        for tipo in (np.int8, np.int16, np.int32):
+            if maior <= np.iinfo(tipo).max:
+                resto = resto.astype(tipo)
+                break
+        return inicio, resto
+
+    def _adicionar(self, b):  # comprime `b` em blocos novos, refazendo o último se ele não estiver cheio
+        if not len(b):
+            return
+        if self._formato is None:
+            self._formato = b.shape[1:]
+        # arredondados em float64 (e descomprimidos em float64), para o erro não ganhar o arredondamento do float32
+        q = np.rint(np.asarray(b, dtype=float) / (2 * self.tolerancia)).astype(np.int64)
+        if self._blocos and sum(map(len, self._blocos[-1])) < self.passos_bloco:
+            q = np.concatenate((self._inteiros(len(self._blocos) - 1), q))
+            self._blocos = self._blocos[:-1]
+        self._blocos = self._blocos + [self._comprimir(q[i:i + self.passos_bloco])
+                                       for i in range(0, len(q), self.passos_bloco)]
+
+    def _inteiros(self, j, resto=()):  # valores arredondados do bloco j, só com as colunas `resto`
+        inicio, dif = self._blocos[j]
+        if resto:
+            inicio = inicio[(slice(None),) + resto]
+            dif = dif[(slice(None),) + resto]
+        return np.cumsum(np.cumsum(np.concatenate((inicio, dif.astype(np.int64))), axis=0), axis=0)
+
+    def _descomprimir(self, j, resto=()):  # bloco j, só com as colunas `resto` dos eixos depois do primeiro
+        cache = self._cache  # lido uma vez só: a trajetória pode ser lida por várias threads (ex. exportações)
+        if not resto and cache[0] == j:
+            return cache[1]
+        x = self._inteiros(j, resto) * (2 * self.tolerancia)
+        if not resto:
+            x.flags.writeable = False
+            self._cache = (j, x)
+        return x
+
+    def anexar(self, bloco):
+        """
+        Retorna uma nova trajetória com os estados de `bloco` adicionados ao final, compartilhando os blocos atuais.
+
+        Parâmetros
+        ----------
+        bloco : array_like
+            Estados a adicionar.
+
+        Retorna
+        -------
+        TrajetoriaComprimida
+        """
+        nova = TrajetoriaComprimida(self.tolerancia, passos_bloco=self.passos_bloco)
+        nova._blocos = self._blocos
+        nova._formato = self._formato
+        nova._adicionar(np.asarray(bloco))
+        nova._fins = np.cumsum([len(i) + len(r) for i, r in nova._blocos], dtype=int)
+        return nova
+
+    def __len__(self):
+        return int(self._fins[-1]) if len(self._fins) else 0
+
+    def buscar(self, valores, lado='left'):
+        """Índices onde `valores` entrariam mantendo a ordem, como `np.searchsorted`. Ver `Trajetoria.buscar`."""
+        return np.searchsorted(np.asarray(self), valores, lado)
+
+    @property
+    def shape(self):
+        return (len(self),) + (self._formato or ())
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def dtype(self):
+        return np.dtype(float)
+
+    @property
+    def nbytes(self):
+        return sum(i.nbytes + r.nbytes for i, r in self._blocos)
+
+    def __array__(self, dtype=None, copy=None):
+        if self._blocos:
+            a = np.concatenate([self._descomprimir(j) for j in range(len(self._blocos))])
+        else:
+            a = np.empty(self.shape)
+        return a if dtype is None else a.astype(dtype, copy=False)
+
+    def __iter__(self):
+        for j in range(len(self._blocos)):
+            yield from self._descomprimir(j)
+
+    def __getitem__(self, i):
+        r = _varios_avancados(self, i)
+        if r is not None:
+            return r
+        if isinstance(i, tuple):  # as colunas pedidas em `resto` são as únicas descomprimidas
+            primeiro, resto = (i[0], i[1:]) if i else (slice(None), ())
+        else:
+            primeiro, resto = i, ()
+        n = len(self)
+        if isinstance(primeiro, slice):
+            k = np.arange(*primeiro.indices(n))
+        else:
+            k = np.asarray(primeiro)
+            if k.dtype == bool:
+                k = np.flatnonzero(k)
+            if np.any((k < -n) | (k >= n)):
+                raise IndexError(f'índices fora dos limites da trajetória de tamanho {n}')
+            k = k % n if n else k
+        if not self._blocos:
+            return np.empty(k.shape + self.shape[1:])[(slice(None),) * k.ndim + resto]
+        # só colunas simples (fatias e índices inteiros ou listas num só eixo) são descomprimidas separadamente
+        avancados = sum(not isinstance(r, slice) for r in resto)
+        colunas = resto if avancados <= 1 or all(np.ndim(r) == 0 for r in resto) else ()
+        b = np.searchsorted(self._fins, k, side='right')  # bloco de cada índice
+        inicios = self._fins - [len(i) + len(r) for i, r in self._blocos]
+        if k.ndim == 0:
+            r = self._descomprimir(int(b), colunas)[int(k) - inicios[b]]
+            return (r if colunas or not resto else r[resto]).copy()
+        k = k.ravel()
+        partes = []
+        ordem = []
+        for j in np.unique(b.ravel()):
+            sel = np.flatnonzero(b.ravel() == j)
+            partes.append(self._descomprimir(j, colunas)[k[sel] - inicios[j]])
+            ordem.append(sel)
+        r = np.concatenate(partes)
+        ordem = np.concatenate(ordem)
+        if not np.array_equal(ordem, np.arange(len(ordem))):  # índices fora de ordem
+            r = r[np.argsort(ordem)]
+        if resto and not colunas:
+            r = r[(slice(None),) + resto]
+        return r.reshape(b.shape + r.shape[1:])
+
+    def __repr__(self):
+        return f'TrajetoriaComprimida(shape={self.shape}, tolerancia={self.tolerancia}, nbytes={self.nbytes})'
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# o pacote fica em `src/` e não é instalado
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
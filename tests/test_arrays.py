@@ -0,0 +1,44 @@
+import numpy as np
+
+from capym import coisas, sim
+
+
+def test_de_arrays_e_estado_sem_copia():
+    rng = np.random.default_rng(0)
+    s0, v0, m0 = rng.normal(size=(5, 2)), rng.normal(size=(5, 2)), rng.uniform(1, 2, 5)
+    simulacao = sim.Sim.de_arrays(s0, v0, m0, nomes=list('abcde'))
+    s, v, m = simulacao.estado()
+    assert np.shares_memory(s, s0) and np.shares_memory(v, v0)
+    assert not s.flags.writeable
+    assert np.array_equal(s, s0) and np.array_equal(v, v0) and np.array_equal(m, m0)
+    copia = s0.copy()
+    simulacao.simular(0.1)
+    s, v, m = simulacao.estado()
+    assert np.array_equal(s0, copia)  # a simulação não altera os arrays originais
+    assert np.array_equal(s, np.array([o.s for o in simulacao.objs]))
+
+
+def test_estado_copia_quando_os_objetos_sao_separados():
+    simulacao = sim.Sim()
+    simulacao.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 5.7), 1))
+    s, v, m = simulacao.estado()
+    assert s.flags.writeable and np.array_equal(s, [(0, 0), (3, 0)])
+
+
+def test_salvar_e_carregar(tmp_path):
+    central = coisas.Particula((0, 0), (0, 0), 100, nome='sol')
+    original = sim.Sim()
+    original.add_obj(central, coisas.Particula((3, 0), (0, 5.7), 1, nome='planeta'))
+    original.configs.update(integrador='wh', central=central, seguir=1, lims=((-8, 8), (-6, 6)), G=1.5)
+    original.simular(0.5)
+    original.salvar(str(tmp_path / 'cena.npz'))
+
+    carregada = sim.Sim.carregar(str(tmp_path / 'cena.npz'))
+    assert [o.nome for o in carregada.objs] == ['sol', 'planeta']
+    assert carregada.configs['integrador'] == 'wh' and carregada.configs['G'] == 1.5
+    assert carregada.configs['central'] is carregada.objs[0] and carregada.configs['seguir'] is carregada.objs[1]
+    assert carregada.configs['lims'] == ((-8, 8), (-6, 6))
+    assert np.array_equal(np.asarray(carregada.dados), np.asarray(original.dados))
+    carregada.simular(0.5)
+    original.simular(0.5)
+    assert np.array_equal(carregada.estado()[0], original.estado()[0])
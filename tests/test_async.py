@@ -0,0 +1,43 @@
+import asyncio
+
+import numpy as np
+
+from capym import coisas, sim
+
+
+def _sistema(**configs):
+    s = sim.Sim()
+    s.configs.update(configs)
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 5.7), 1))
+    return s
+
+
+def _passos(s, *args, **kwargs):
+    async def coletar():
+        return [(t, p.copy()) async for t, p in s.passos_async(*args, **kwargs)]
+    return asyncio.run(coletar())
+
+
+def test_simular_async_igual_a_simular():
+    a = _sistema()
+    a.simular(1)
+    b = _sistema()
+    assert asyncio.run(b.simular_async(1, passos_bloco=30)) is True
+    assert np.array_equal(np.asarray(a.dados), np.asarray(b.dados))
+
+
+def test_passos_async_entrega_todos_os_passos():
+    ref = _sistema()
+    ref.simular(1)
+    passos = _passos(_sistema(), 1, passos_bloco=30)
+    assert np.allclose([t for t, _ in passos], np.asarray(ref.tempos))
+    assert np.array_equal(np.stack([p for _, p in passos]), np.asarray(ref.dados))
+
+
+def test_passos_async_com_capacidade_menor_que_o_bloco():
+    ref = _sistema()
+    ref.simular(1)
+    s = _sistema(capacidade=70)
+    passos = _passos(s, 1, passos_bloco=1000)
+    assert len(passos) == 100 and len(s.tempos) == 70
+    assert np.array_equal(np.stack([p for _, p in passos]), np.asarray(ref.dados))
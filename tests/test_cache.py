@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+
+from capym import cache, coisas, forcas, sim
+
+
+def _sistema(cache_resultados, v=5.7):
+    s = sim.Sim()
+    s.configs['cache'] = cache_resultados
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, v), 1))
+    return s
+
+
+def _npz(diretorio):
+    return sorted(f for f in os.listdir(diretorio) if f.endswith('.npz'))
+
+
+def test_acerto_reproduz_resultado(tmp_path, capsys):
+    c = cache.CacheResultados(str(tmp_path))
+    a = _sistema(c)
+    a.simular(1)
+    assert len(_npz(tmp_path)) == 1
+    b = _sistema(c)
+    b.simular(1)
+    assert 'recuperado do cache' in capsys.readouterr().out
+    assert np.array_equal(np.asarray(a.dados), np.asarray(b.dados))
+    assert np.array_equal(np.asarray(a.vels), np.asarray(b.vels))
+    assert np.array_equal(a.estado()[0], b.estado()[0]) and a._t == b._t
+
+
+def test_falhas_quando_algo_muda(tmp_path, capsys):
+    c = cache.CacheResultados(str(tmp_path))
+    _sistema(c).simular(1)
+    _sistema(c, v=5.8).simular(1)  # estado inicial
+    _sistema(c).simular(2)  # número de passos
+    _sistema(c).simular(1, 0.02)  # passo
+    s = _sistema(c)
+    s.configs['integrador'] = 'wh'
+    s.simular(1)
+    s = _sistema(c)
+    s.configs['G'] = 2
+    s.simular(1)
+    assert 'recuperado do cache' not in capsys.readouterr().out
+    assert len(_npz(tmp_path)) == 6
+
+
+def test_forcas_nao_usam_o_cache(tmp_path):
+    c = cache.CacheResultados(str(tmp_path))
+    s = _sistema(c)
+    s.configs['forcas'] = [forcas.ArrastoLinear(0.1)]
+    s.simular(1)
+    assert _npz(tmp_path) == []
+
+
+def test_despejo_dos_mais_antigos(tmp_path):
+    c = cache.CacheResultados(str(tmp_path), max_mb=0.3)
+    for i, chave in enumerate('abc'):
+        c.guardar(chave, x=np.zeros(12000))  # cerca de 0.09 MB cada
+        os.utime(tmp_path / f'{chave}.npz', (i, i))  # ordem de uso conhecida
+    c.guardar('d', x=np.zeros(12000))
+    assert _npz(tmp_path) == ['b.npz', 'c.npz', 'd.npz']
+    assert c.ler('a') is None
+    assert c.ler('b')['x'].shape == (12000,)
+
+
+def test_resultado_maior_que_o_limite_nao_e_guardado(tmp_path):
+    c = cache.CacheResultados(str(tmp_path), max_mb=0.5)
+    c.guardar('grande', x=np.zeros(100000))
+    assert _npz(tmp_path) == []
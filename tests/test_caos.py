@@ -0,0 +1,26 @@
+import pytest
+
+from capym import caos, coisas, sim
+
+
+def _sistema():
+    s = sim.Sim()
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 5.7), 1))
+    return s
+
+
+def test_expoentes_ordenados():
+    ly = caos.lyapunov(_sistema(), 2, quantidade=3, semente=0)
+    assert len(ly.expoentes) == 3 and list(ly.expoentes) == sorted(ly.expoentes, reverse=True)
+    assert ly.evolucao.shape == (len(ly.tempos), 3)
+
+
+@pytest.mark.parametrize('kwargs', [{'t': 0}, {'t': -1}, {'t': 1, 'quantidade': 9}, {'t': 1, 'quantidade': 0}])
+def test_argumentos_invalidos(kwargs):
+    with pytest.raises(ValueError):
+        caos.lyapunov(_sistema(), **kwargs)
+
+
+def test_sem_objetos():
+    with pytest.raises(ValueError):
+        caos.lyapunov(sim.Sim(), 1)
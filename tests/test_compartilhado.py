@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from capym import coisas, compartilhado, sim
+
+
+def test_leitor_ve_o_estado_publicado():
+    s = sim.Sim()
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 5.7), 1))
+    with compartilhado.Publicador(capacidade=20, intervalo=0) as pub:
+        s.configs['publicar'] = pub
+        s.simular(1)
+        with compartilhado.Leitor(pub.nome) as leitor:
+            inst = leitor.ler()
+            assert inst.seq % 2 == 0
+            assert np.isclose(inst.t, s._t) and np.array_equal(inst.s, s.estado()[0])
+            assert np.allclose(inst.tempos, np.asarray(s.tempos)[-20:])
+            assert np.array_equal(inst.dados, np.asarray(s.dados)[-20:])
+
+
+def test_erro_na_escrita_nao_trava_os_leitores():
+    with compartilhado.Publicador(capacidade=3) as pub:
+        pub.publicar(0.0, np.zeros((2, 2)), np.zeros((2, 2)))
+        with pytest.raises(ValueError):
+            pub.publicar(1.0, np.zeros((2, 2)), np.zeros((2, 2)), [1.0], np.zeros((1, 3, 2)))
+        with compartilhado.Leitor(pub.nome) as leitor:
+            assert leitor.seq % 2 == 0
+            leitor.ler(espera=0.1)
+
+
+def test_leitor_de_bloco_inexistente():
+    with pytest.raises(FileNotFoundError):
+        compartilhado.Leitor('capym-nao-existe')
@@ -0,0 +1,57 @@
+import numpy as np
+
+from capym import coisas, eventos, forcas, sim
+
+
+def _reta():  # objeto 1 em movimento retilíneo uniforme, afastando-se do objeto 0 parado
+    s = sim.Sim()
+    s.configs['G'] = 0
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 1), coisas.Particula((0, 0), (1, 0), 1))
+    return s
+
+
+def test_instante_entre_passos():
+    s = _reta()
+    s.simular(1, 0.1, eventos=eventos.distancia(0, 1, 0.555))
+    assert len(s.ocorrencias) == 1
+    oc = s.ocorrencias[0]
+    assert oc.nome == 'distancia'
+    assert abs(oc.t - 0.555) < 1e-9
+    assert np.allclose(oc.s[1], (0.555, 0))
+
+
+def test_evento_terminal_para_no_instante():
+    s = _reta()
+    assert s.simular(1, 0.1, eventos=eventos.distancia(0, 1, 0.555, terminal=True)) is False
+    assert abs(s._t - 0.555) < 1e-9
+    assert np.allclose(s.objs[1].s, (0.555, 0))
+
+
+def test_direcao():
+    s = _reta()
+    s.simular(1, 0.1, eventos=eventos.distancia(0, 1, 0.555, direcao=-1))  # só aproximações
+    assert s.ocorrencias == []
+
+
+def test_queda_livre():
+    s = sim.Sim()
+    s.configs['G'] = 0
+    s.configs['forcas'] = [forcas.CampoConstante((0, -10))]
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 1), coisas.Particula((0, 5), (0, 0), 1))
+    chao = eventos.Evento(lambda t, s, v, i: s[i, 1], (1,), terminal=True, nome='chao')
+    s.simular(2, 0.001, eventos=chao)
+    assert s.ocorrencias[0].nome == 'chao'
+    assert abs(s._t - 1.0) < 5e-3  # queda de 5 m com g = 10, a menos do erro do Euler
+    assert abs(s.objs[1].s[1]) < 1e-9  # a raiz é encontrada dentro do passo
+
+
+def test_periastro_a_cada_periodo():
+    s = sim.Sim()
+    s.configs['integrador'] = 'wh'
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 7), 0))
+    s.simular(30, 0.01, eventos=eventos.vel_radial(1, 0, direcao=1))
+    t = np.array([o.t for o in s.ocorrencias])
+    a = 1 / (2 / 3 - 7 ** 2 / 100)  # semieixo maior pela equação da vis-viva
+    periodo = 2 * np.pi * np.sqrt(a ** 3 / 100)
+    assert len(t) >= 2
+    assert np.allclose(np.diff(t), periodo, rtol=1e-8)
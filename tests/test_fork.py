@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from capym import coisas, forcas, sim
+
+
+def _sistema():
+    s = sim.Sim()
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 5.7), 1),
+              coisas.Particula((-5, 0), (0, -4.4), 1))
+    return s
+
+
+def test_fork_independente_do_original():
+    base = _sistema()
+    base.simular(0.5)
+    ramo = base.fork()
+    ramo.objs[1].v = ramo.objs[1].v + (0, 0.5)
+    ramo.simular(0.5)
+    antes = np.asarray(base.dados).copy()
+    assert len(base.tempos) == 50 and len(ramo.tempos) == 100
+    assert np.array_equal(np.asarray(ramo.dados)[:50], antes)  # passos anteriores ao fork compartilhados
+
+    ref = _sistema()
+    ref.simular(1.0)
+    base.simular(0.5)
+    assert np.array_equal(np.asarray(base.dados), np.asarray(ref.dados))  # o ramo não mudou a base
+    assert not np.allclose(ramo.objs[1].s, base.objs[1].s)
+
+
+def test_fork_configs_e_forcas_proprias():
+    base = _sistema()
+    base.configs['forcas'] = [forcas.ArrastoLinear(0.1)]
+    ramo = base.fork()
+    ramo.configs['forcas'].append(forcas.CampoConstante((0, -1)))
+    ramo.configs['G'] = 2
+    assert len(base.configs['forcas']) == 1 and base.configs['G'] == 1
+
+
+def test_fork_molas_apontam_para_as_copias():
+    base = sim.Sim()
+    a, b = coisas.Particula((0, 0), (0, 0), 1), coisas.Particula((1, 0), (0, 0), 1)
+    base.add_obj(a, b)
+    base.configs['forcas'] = [forcas.Molas([(a, b)], k=2, l0=0.5)]
+    ramo = base.fork()
+    assert ramo.configs['forcas'][0].pares[0][0] is ramo.objs[0]
+    assert base.configs['forcas'][0].pares[0][0] is a
+    ramo.simular(0.5)
+    base.simular(0.5)
+    assert np.array_equal(ramo.objs[1].s, base.objs[1].s)
+
+
+def test_fork_seguir_e_central_apontam_para_as_copias():
+    base = _sistema()
+    base.configs['seguir'] = base.objs[1]
+    base.configs['central'] = base.objs[0]
+    ramo = base.fork()
+    assert ramo.configs['seguir'] is ramo.objs[1]
+    assert ramo.configs['central'] is ramo.objs[0]
+
+
+def test_fork_estado_em_parte_do_fork():
+    base = _sistema()
+    base.simular(1)
+    ramo = base.fork()
+    ramo.objs[1].v = ramo.objs[1].v + (0, 0.3)
+    with pytest.raises(ValueError):
+        ramo.estado_em(0.5)
+    s, v = ramo.estado_em(1.5)
+    ramo.simular(0.5)
+    assert np.allclose(s, ramo.estado()[0]) and np.allclose(v, ramo.estado()[1])
+    assert not np.allclose(s, base.estado_em(1.5)[0])
@@ -0,0 +1,31 @@
+import numpy as np
+
+from capym import analise, coisas, sim
+
+
+def _sistema(integrador):
+    s = sim.Sim()
+    s.configs['integrador'] = integrador
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 5.7), 1),
+              coisas.Particula((-5, 0), (0, -4.4), 0.5))
+    return s
+
+
+def test_wh_concorda_com_euler_de_passo_fino():
+    fino = _sistema('euler')
+    fino.simular(1, 5e-5)
+    wh = _sistema('wh')
+    wh.simular(1, 0.01)
+    grosso = _sistema('euler')
+    grosso.simular(1, 0.01)
+    erro_wh = np.abs(wh.estado()[0] - fino.estado()[0]).max()
+    erro_euler = np.abs(grosso.estado()[0] - fino.estado()[0]).max()
+    assert erro_wh < 1e-3  # limitado pelo próprio erro do Euler fino
+    assert erro_wh < erro_euler / 50
+
+
+def test_wh_conserva_energia():
+    s = _sistema('wh')
+    s.simular(20, 0.01)
+    e = analise.energia(s)
+    assert np.abs(e / e[0] - 1).max() < 1e-4
@@ -0,0 +1,58 @@
+import numpy as np
+
+from capym import coisas, sim
+
+
+def _sistema():
+    s = sim.Sim()
+    s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 5.7), 1),
+              coisas.Particula((-5, 0), (0, -4.4), 0.5))
+    return s
+
+
+class _CancelarDepois:  # sinal de cancelamento marcado depois de `k` consultas, para parar num passo conhecido
+    def __init__(self, k):
+        self.k = k
+
+    def is_set(self):
+        self.k -= 1
+        return self.k < 0
+
+
+def _confere_prefixo(parcial, n):
+    p = len(parcial.tempos)
+    assert 0 < p < n
+    ref = _sistema()
+    ref.simular((p - 0.5) * parcial.h, parcial.h)  # exatamente os p passos feitos
+    assert np.array_equal(np.asarray(parcial.dados), np.asarray(ref.dados))
+    assert np.array_equal(np.asarray(parcial.vels), np.asarray(ref.vels))
+    assert np.allclose(np.asarray(parcial.tempos), np.asarray(ref.tempos))
+    assert np.array_equal(parcial.estado()[0], ref.estado()[0])
+    assert np.isclose(parcial._t, ref._t)
+    # continuar de onde parou dá o mesmo resultado que a simulação sem interrupção
+    parcial.simular(0.5, parcial.h)
+    ref.simular(0.5, parcial.h)
+    assert np.array_equal(parcial.estado()[0], ref.estado()[0])
+
+
+def test_cancelar_guarda_prefixo_consistente():
+    s = _sistema()
+    assert s.simular(2, cancelar=_CancelarDepois(73)) is False
+    assert len(s.tempos) == 73
+    _confere_prefixo(s, 200)
+
+
+def test_orcamento_guarda_prefixo_consistente():
+    s = _sistema()
+    assert s.simular(1000, orcamento=0.05) is False
+    _confere_prefixo(s, 100000)
+
+
+def test_progresso_final_sem_estimativa_quando_para_antes():
+    chamadas = []
+    s = _sistema()
+    s.simular(2, cancelar=_CancelarDepois(10), progresso=lambda feitos, total, eta: chamadas.append((feitos, eta)))
+    assert chamadas[-1][0] < 200 and chamadas[-1][1] == np.inf
+    chamadas.clear()
+    s.simular(0.5, progresso=lambda feitos, total, eta: chamadas.append((feitos, eta)))
+    assert chamadas[-1] == (50, 0.0)
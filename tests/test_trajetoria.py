@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from capym import trajetoria as trj
+
+# índices comparados com os do numpy: fatias, inteiros, listas, máscaras e vários índices avançados juntos
+INDICES = [slice(None), slice(3, 17), slice(None, None, -3), slice(25, 2, -2), 0, -1, 13, [5, 0, 3, 1],
+           np.array([[0, 1], [2, 3]]), (slice(2, 20), 1), (3, [0, 2]), (slice(None), slice(None), 0),
+           (np.array([1, 2]), 0), (slice(10, 20), [1, 3], 0), ([5, 9], [0, 2]), ([1, 6], [0, 2], 1),
+           ([1, 6], slice(None), [0, 1]), (np.array([[1, 2], [3, 4]]), 0), ([3, 3, -1], [1, 1, 2], 0), ()]
+
+
+def _estados(n=30, semente=0):
+    return np.random.default_rng(semente).normal(size=(n, 4, 2))
+
+
+@pytest.mark.parametrize('indice', INDICES, ids=repr)
+def test_trajetoria_indices_como_numpy(indice):
+    f = _estados()
+    t = trj.Trajetoria([f[:10], f[10:11], f[11:]])
+    assert np.array_equal(t[indice], f[indice])
+
+
+def test_trajetoria_mascara_e_array():
+    f = _estados()
+    t = trj.Trajetoria([f[:7], f[7:]])
+    mascara = np.arange(len(f)) % 3 == 0
+    assert np.array_equal(t[mascara], f[mascara])
+    assert np.array_equal(np.asarray(t), f)
+    assert np.array_equal(np.stack(list(t)), f)
+    assert t.shape == f.shape and len(t) == len(f)
+
+
+def test_trajetoria_fora_dos_limites():
+    t = trj.Trajetoria([_estados(5)])
+    with pytest.raises(IndexError):
+        t[5]
+
+
+def test_trajetoria_anexar_nao_altera_a_original():
+    f = _estados()
+    t = trj.Trajetoria([f[:10]])
+    nova = t.anexar(f[10:])
+    assert len(t) == 10 and len(nova) == len(f)
+    assert np.array_equal(np.asarray(nova), f)
+
+
+@pytest.mark.parametrize('lado', ['left', 'right'])
+def test_trajetoria_buscar_como_searchsorted(lado):
+    tempos = np.arange(20.0)
+    t = trj.Trajetoria([tempos[:5], tempos[5:9], tempos[9:]])
+    valores = np.linspace(-2, 22, 97)
+    assert np.array_equal(t.buscar(valores, lado), np.searchsorted(tempos, valores, lado))
+    assert t.buscar(4.0, lado) == np.searchsorted(tempos, 4.0, lado)
+
+
+@pytest.mark.parametrize('indice', INDICES, ids=repr)
+def test_circular_indices_como_numpy(indice):
+    f = _estados(50)
+    t = trj.TrajetoriaCircular(30, [f[:12], f[12:31], f[31:]])  # o buffer já deu a volta
+    assert np.array_equal(t[indice], f[-30:][indice])
+
+
+def test_circular_guarda_so_os_ultimos():
+    rng = np.random.default_rng(1)
+    t = trj.TrajetoriaCircular(7)
+    todos = []
+    for _ in range(10):
+        b = rng.normal(size=(rng.integers(0, 12), 3, 2))
+        todos.append(b)
+        assert t.anexar(b) is t  # alterada no lugar
+        f = np.concatenate(todos)[-7:]
+        assert len(t) == len(f)
+        assert np.array_equal(np.asarray(t), f)
+
+
+def test_circular_copia_independente():
+    f = _estados()
+    t = trj.TrajetoriaCircular(10, [f[:10]])
+    copia = trj.TrajetoriaCircular(t.capacidade, [t])
+    t.anexar(f[10:15])
+    assert np.array_equal(np.asarray(copia), f[:10])
+    assert np.array_equal(np.asarray(t), f[5:15])
+
+
+def _orbitas(n, t0=0.0):  # estados suaves, como os de uma simulação
+    t = t0 + 0.01 * np.arange(n)
+    return np.stack([np.stack([np.cos(t * (j + 1)) * (j + 3), np.sin(t * (j + 1.3)) * 3], -1) for j in range(4)], 1)
+
+
+@pytest.mark.parametrize('indice', INDICES, ids=repr)
+def test_comprimida_indices_como_numpy(indice):
+    tol = 1e-6
+    f = _orbitas(30)
+    t = trj.TrajetoriaComprimida(tol, [f[:7], f[7:]], passos_bloco=8)
+    esperado = f[indice]
+    assert t[indice].shape == esperado.shape
+    assert np.abs(t[indice] - esperado).max(initial=0) <= tol
+
+
+def test_comprimida_erro_maximo_ao_anexar():
+    tol = 1e-4
+    rng = np.random.default_rng(2)
+    t = trj.TrajetoriaComprimida(tol, passos_bloco=50)
+    versoes = [t]
+    partes = []
+    feitos = 0
+    for _ in range(12):
+        n = int(rng.integers(0, 90))
+        partes.append(_orbitas(n, 0.01 * feitos))
+        feitos += n
+        t = t.anexar(partes[-1])
+        versoes.append(t)
+        f = np.concatenate(partes)
+        assert len(t) == len(f)
+        assert np.abs(np.asarray(t) - f).max(initial=0) <= tol
+    assert len(versoes[3]) == sum(map(len, partes[:3]))  # versões anteriores não mudam
+    assert t.nbytes < f.nbytes / 4
+
+
+def test_comprimida_float32_mantem_erro_maximo():
+    tol = 1e-5
+    f = _orbitas(500).astype(np.float32)
+    t = trj.TrajetoriaComprimida(tol, [f])
+    assert t.dtype == np.float64
+    assert np.abs(np.asarray(t) - f.astype(float)).max() <= tol
+
+
+def test_simulacao_comprimida():
+    from capym import coisas, sim
+
+    def sistema(**configs):
+        s = sim.Sim()
+        s.configs.update(configs)
+        s.add_obj(coisas.Particula((0, 0), (0, 0), 100), coisas.Particula((3, 0), (0, 5.7), 1),
+                  coisas.Particula((-5, 0), (0, -4.4), 1))
+        s.simular(5, 0.001)
+        return s
+
+    ref = sistema()
+    for configs in ({}, {'precisao_dados': 'float32'}):
+        s = sistema(compressao=1e-5, **configs)
+        assert isinstance(s.dados, trj.TrajetoriaComprimida)
+        assert np.abs(np.asarray(s.dados) - np.asarray(ref.dados)).max() <= 1e-5
+        assert np.abs(np.asarray(s.vels) - np.asarray(ref.vels)).max() <= 1e-5
+        assert np.array_equal(s.estado()[0], ref.estado()[0])  # o estado da integração não é comprimido